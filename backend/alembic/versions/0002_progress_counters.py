@@ -0,0 +1,46 @@
+"""user deck progress counters
+
+Revision ID: 0002_progress_counters
+Revises: 0001_initial
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002_progress_counters"
+down_revision: Union[str, None] = "0001_initial"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("user_deck_progress", sa.Column("cards_reviewed", sa.Integer(), server_default="0", nullable=False))
+    op.add_column("user_deck_progress", sa.Column("total_cards", sa.Integer(), server_default="0", nullable=False))
+
+    # Backfill from history; equivalent to scripts/rebuild_progress.py.
+    op.execute(
+        """
+        UPDATE user_deck_progress SET
+            total_cards = (
+                SELECT count(cards.id) FROM cards WHERE cards.deck_id = user_deck_progress.deck_id
+            ),
+            cards_reviewed = (
+                SELECT count(DISTINCT quiz_responses.card_id)
+                FROM quiz_responses
+                JOIN quiz_sessions ON quiz_sessions.id = quiz_responses.session_id
+                JOIN cards ON cards.id = quiz_responses.card_id
+                WHERE quiz_sessions.user_id = user_deck_progress.user_id
+                  AND cards.deck_id = user_deck_progress.deck_id
+            )
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("user_deck_progress", "total_cards")
+    op.drop_column("user_deck_progress", "cards_reviewed")
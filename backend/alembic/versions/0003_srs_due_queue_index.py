@@ -0,0 +1,25 @@
+"""srs due queue index
+
+Revision ID: 0003_srs_due_queue_index
+Revises: 0002_progress_counters
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003_srs_due_queue_index"
+down_revision: Union[str, None] = "0002_progress_counters"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_srs_reviews_user_id_due_at", "srs_reviews", ["user_id", "due_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_srs_reviews_user_id_due_at", table_name="srs_reviews")
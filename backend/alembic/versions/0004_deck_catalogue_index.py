@@ -0,0 +1,25 @@
+"""deck catalogue keyset index
+
+Revision ID: 0004_deck_catalogue_index
+Revises: 0003_srs_due_queue_index
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004_deck_catalogue_index"
+down_revision: Union[str, None] = "0003_srs_due_queue_index"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_decks_created_at_id", "decks", ["created_at", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_decks_created_at_id", table_name="decks")
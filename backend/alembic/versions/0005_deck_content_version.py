@@ -0,0 +1,26 @@
+"""deck content version
+
+Revision ID: 0005_deck_content_version
+Revises: 0004_deck_catalogue_index
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005_deck_content_version"
+down_revision: Union[str, None] = "0004_deck_catalogue_index"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("decks", sa.Column("content_version", sa.Integer(), server_default="1", nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column("decks", "content_version")
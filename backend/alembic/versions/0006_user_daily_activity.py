@@ -0,0 +1,56 @@
+"""user daily activity rollup
+
+Revision ID: 0006_user_daily_activity
+Revises: 0005_deck_content_version
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006_user_daily_activity"
+down_revision: Union[str, None] = "0005_deck_content_version"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "user_daily_activity",
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), primary_key=True),
+        sa.Column("activity_date", sa.Date(), primary_key=True),
+        sa.Column("sessions_completed", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("answers", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("correct", sa.Integer(), server_default="0", nullable=False),
+    )
+
+    # Backfill from history; equivalent to scripts/backfill_activity.py. Days are UTC.
+    utc_day = "date(timezone('UTC', {}))" if op.get_bind().dialect.name == "postgresql" else "date({})"
+    started_day = utc_day.format("started_at")
+    responded_day = utc_day.format("quiz_responses.responded_at")
+    op.execute(
+        f"""
+        INSERT INTO user_daily_activity (user_id, activity_date, sessions_completed, answers, correct)
+        SELECT user_id, activity_date, sum(sessions_completed), sum(answers), sum(correct)
+        FROM (
+            SELECT user_id, {started_day} AS activity_date,
+                   1 AS sessions_completed, 0 AS answers, 0 AS correct
+            FROM quiz_sessions
+            WHERE status = 'completed'
+            UNION ALL
+            SELECT quiz_sessions.user_id, {responded_day},
+                   0, 1, CASE WHEN quiz_responses.is_correct THEN 1 ELSE 0 END
+            FROM quiz_responses
+            JOIN quiz_sessions ON quiz_sessions.id = quiz_responses.session_id
+        ) AS events
+        GROUP BY user_id, activity_date
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("user_daily_activity")
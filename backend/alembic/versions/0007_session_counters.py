@@ -0,0 +1,52 @@
+"""quiz session response counters
+
+Revision ID: 0007_session_counters
+Revises: 0006_user_daily_activity
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0007_session_counters"
+down_revision: Union[str, None] = "0006_user_daily_activity"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COUNTERS = ("total_responses", "correct_count", "incorrect_count", "unanswered_count")
+
+
+def upgrade() -> None:
+    for name in COUNTERS:
+        op.add_column("quiz_sessions", sa.Column(name, sa.Integer(), server_default="0", nullable=False))
+
+    # Backfill from history; equivalent to scripts/check_session_counters.py --repair.
+    op.execute(
+        """
+        UPDATE quiz_sessions SET
+            total_responses = (
+                SELECT count(*) FROM quiz_responses WHERE quiz_responses.session_id = quiz_sessions.id
+            ),
+            correct_count = (
+                SELECT count(*) FROM quiz_responses
+                WHERE quiz_responses.session_id = quiz_sessions.id AND quiz_responses.is_correct IS TRUE
+            ),
+            incorrect_count = (
+                SELECT count(*) FROM quiz_responses
+                WHERE quiz_responses.session_id = quiz_sessions.id AND quiz_responses.is_correct IS FALSE
+            ),
+            unanswered_count = (
+                SELECT count(*) FROM quiz_responses
+                WHERE quiz_responses.session_id = quiz_sessions.id AND quiz_responses.is_correct IS NULL
+            )
+        """
+    )
+
+
+def downgrade() -> None:
+    for name in reversed(COUNTERS):
+        op.drop_column("quiz_sessions", name)
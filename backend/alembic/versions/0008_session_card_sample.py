@@ -0,0 +1,28 @@
+"""session card sample and per-deck card id index
+
+Revision ID: 0008_session_card_sample
+Revises: 0007_session_counters
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0008_session_card_sample"
+down_revision: Union[str, None] = "0007_session_counters"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("quiz_sessions", sa.Column("card_ids", sa.JSON(), nullable=True))
+    op.create_index("ix_cards_deck_id_id", "cards", ["deck_id", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_cards_deck_id_id", table_name="cards")
+    op.drop_column("quiz_sessions", "card_ids")
@@ -0,0 +1,41 @@
+"""full-text search indexes on decks and cards
+
+Revision ID: 0009_full_text_search
+Revises: 0008_session_card_sample
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+from app.models.search import SEARCH_COLUMNS, search_ddl
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0009_full_text_search"
+down_revision: Union[str, None] = "0008_session_card_sample"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    for statement in search_ddl(dialect):
+        op.execute(statement)
+    if dialect == "sqlite":
+        # External-content FTS tables start empty; index the existing rows once.
+        for table in SEARCH_COLUMNS:
+            op.execute(f"INSERT INTO {table}_fts({table}_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    for table in SEARCH_COLUMNS:
+        if dialect == "sqlite":
+            for suffix in ("ai", "ad", "au"):
+                op.execute(f"DROP TRIGGER IF EXISTS {table}_fts_{suffix}")
+            op.execute(f"DROP TABLE IF EXISTS {table}_fts")
+        elif dialect == "postgresql":
+            op.execute(f"DROP INDEX IF EXISTS ix_{table}_search_vector")
+            op.execute(f"ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector")
@@ -0,0 +1,28 @@
+"""deck created_at at full precision on SQLite
+
+Revision ID: 0010_deck_created_at_precision
+Revises: 0009_full_text_search
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0010_deck_created_at_precision"
+down_revision: Union[str, None] = "0009_full_text_search"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CURRENT_TIMESTAMP wrote 'YYYY-MM-DD HH:MM:SS'; new rows carry microseconds. Give old rows
+    # the same text form so the catalogue keyset compares them correctly.
+    if op.get_bind().dialect.name == "sqlite":
+        op.execute("UPDATE decks SET created_at = created_at || '.000000' WHERE length(created_at) = 19")
+
+
+def downgrade() -> None:
+    pass
@@ -0,0 +1,30 @@
+"""keep quiz responses when their card is deleted
+
+Revision ID: 0011_response_card_nullable
+Revises: 0010_deck_created_at_precision
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0011_response_card_nullable"
+down_revision: Union[str, None] = "0010_deck_created_at_precision"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Deleting a card now detaches its answers instead of deleting them.
+    with op.batch_alter_table("quiz_responses") as batch_op:
+        batch_op.alter_column("card_id", existing_type=sa.Integer(), nullable=True)
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM quiz_responses WHERE card_id IS NULL")
+    with op.batch_alter_table("quiz_responses") as batch_op:
+        batch_op.alter_column("card_id", existing_type=sa.Integer(), nullable=False)
@@ -4,6 +4,7 @@ from sqlmodel import Session, select
 from ..db.session import get_db
 from ..models import User, UserRole
 from ..services.auth import hash_password
+from ..services.user_cache import user_cache
 
 
 def get_or_create_default_user(db: Session) -> User:
@@ -28,23 +29,37 @@ def get_or_create_default_user(db: Session) -> User:
     return user
 
 
-def get_current_user(
-    db: Session = Depends(get_db),
-) -> User:
+def resolve_request_user(db: Session = Depends(get_db)) -> User:
+    """
+    Resolve the request's user exactly once.
+
+    FastAPI caches this dependency for the life of the request, so every
+    user dependency below shares one resolution. A warm process-wide cache
+    entry is re-attached to the session without a query.
+    """
+    user_id = user_cache.get_default_user_id()
+    snapshot = user_cache.get(user_id) if user_id is not None else None
+    if snapshot is not None:
+        return db.merge(snapshot, load=False)
+
+    user = get_or_create_default_user(db)
+    user_cache.put(user, default=True)
+    return user
+
+
+def get_current_user(user: User = Depends(resolve_request_user)) -> User:
     """Simplified: Always return the default user."""
-    return get_or_create_default_user(db)
+    return user
 
 
-def get_current_user_optional(
-    db: Session = Depends(get_db),
-) -> User:
+def get_current_user_optional(user: User = Depends(resolve_request_user)) -> User:
     """Simplified: Always return the default user (not optional anymore)."""
-    return get_or_create_default_user(db)
+    return user
 
 
-def get_current_active_user(db: Session = Depends(get_db)) -> User:
+def get_current_active_user(user: User = Depends(resolve_request_user)) -> User:
     """Simplified: Always return the default user."""
-    return get_or_create_default_user(db)
+    return user
 
 
 def get_current_admin(current_user: User = Depends(get_current_active_user)) -> User:
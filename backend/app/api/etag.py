@@ -0,0 +1,27 @@
+"""Conditional GET helpers built on the deck content version."""
+
+from datetime import datetime
+
+from fastapi import Request, Response, status
+
+
+def deck_etag(deck_id: int, content_version: int, created_at: datetime, scope: str = "deck") -> str:
+    """
+    Entity tag for one version of a row's content.
+
+    The row's creation time is part of the tag because ids can be reused
+    (SQLite hands out a deleted max rowid again) and a recreated row starts
+    over at the same content version.
+    """
+    return f'"{scope}-{deck_id}-{int(created_at.timestamp() * 1_000_000):x}-v{content_version}"'
+
+
+def not_modified(request: Request, etag: str) -> Response | None:
+    """Return a 304 response when If-None-Match already names ``etag``."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return None
+    candidates = {candidate.strip().removeprefix("W/") for candidate in header.split(",")}
+    if "*" in candidates or etag in candidates:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    return None
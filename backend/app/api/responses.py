@@ -0,0 +1,25 @@
+"""JSON response class for large, trusted payloads."""
+
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is listed in requirements
+    orjson = None
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    Render with orjson when it is installed, falling back to the stdlib encoder.
+
+    Routes opt in by returning this class directly. FastAPI then skips
+    ``response_model`` validation, so the content must already be trusted data
+    (plain dicts/lists or ``model_dump()`` output built from ORM rows).
+    """
+
+    def render(self, content: Any) -> bytes:
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
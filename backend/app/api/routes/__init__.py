@@ -1,4 +1,3 @@
-from . import auth, decks, study, users
-
-__all__ = ["auth", "decks", "study", "users"]
+from . import auth, decks, metrics, search, study, users
 
+__all__ = ["auth", "decks", "metrics", "search", "study", "users"]
@@ -1,13 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+import io
+from typing import Literal
+
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, Response, UploadFile, status
+from fastapi.responses import StreamingResponse
 from sqlmodel import Session
 
 from ...api.deps import get_current_active_user, get_current_user_optional
+from ...api.etag import deck_etag, not_modified
+from ...api.responses import FastJSONResponse
 from ...db.session import get_db
 from ...models import Card, Deck, User
 from ...models.enums import UserRole
-from ...schemas.card import CardCreate, CardRead, CardUpdate
+from ...schemas.card import CardCreate, CardImportResult, CardRead, CardUpdate
 from ...schemas.common import Message
-from ...schemas.deck import DeckCreate, DeckRead, DeckSummary, DeckUpdate, TagRead
+from ...schemas.deck import DeckCreate, DeckRead, DeckSummary, DeckUpdate
 from ...services import decks as deck_service
 
 
@@ -22,115 +28,88 @@ def list_decks(
     tag: str | None = Query(default=None, description="Filter by tag"),
     limit: int = Query(default=20, le=100),
     offset: int = Query(default=0, ge=0),
+    cursor: str | None = Query(default=None, description="Opaque cursor from X-Next-Cursor; overrides offset"),
+    include_total: bool = Query(default=False, description="Send the match count in X-Total-Count"),
+    approximate_total: bool = Query(default=False, description="Allow an estimated X-Total-Count"),
     current_user: User | None = Depends(get_current_user_optional),
+    response: Response,
 ) -> list[DeckSummary]:
-    summaries, _ = deck_service.list_decks(db, current_user, search=q, tag=tag, limit=limit, offset=offset)
+    summaries, total, next_cursor = deck_service.list_decks(
+        db,
+        current_user,
+        search=q,
+        tag=tag,
+        limit=limit,
+        offset=offset,
+        cursor=cursor,
+        count_total=include_total,
+        approximate_total=approximate_total,
+    )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    if total is not None:
+        response.headers["X-Total-Count"] = str(total)
     return summaries
 
 
-@router.get("/{deck_id}", response_model=DeckRead)
+@router.get("/{deck_id}", response_model=DeckRead, response_class=FastJSONResponse)
 def read_deck(
     deck_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User | None = Depends(get_current_user_optional),
+) -> Response:
+    deck = deck_service.get_deck_by_id(db, deck_id)
+    if not deck.is_public and (not current_user or deck.owner_user_id != current_user.id):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Deck is private")
+    etag = deck_etag(deck.id, deck.content_version, deck.created_at)
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    return FastJSONResponse(deck_service.deck_read_payload(db, deck), headers={"ETag": etag})
+
+
+@router.get("/{deck_id}/export")
+def export_deck(
+    deck_id: int,
+    export_format: Literal["ndjson", "csv"] = Query(default="ndjson", alias="format"),
     db: Session = Depends(get_db),
     current_user: User | None = Depends(get_current_user_optional),
-) -> DeckRead:
+) -> StreamingResponse:
+    """Stream every card of a deck as NDJSON or CSV."""
     deck = deck_service.get_deck_by_id(db, deck_id)
     if not deck.is_public and (not current_user or deck.owner_user_id != current_user.id):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Deck is private")
-    return DeckRead(
-        id=deck.id,
-        title=deck.title,
-        description=deck.description,
-        is_public=deck.is_public,
-        owner_user_id=deck.owner_user_id,
-        created_at=deck.created_at,
-        updated_at=deck.updated_at,
-        tags=[TagRead(id=tag.id, name=tag.name) for tag in deck.tags],
-        cards=[
-            CardRead(
-                id=card.id,
-                deck_id=card.deck_id,
-                type=card.type,
-                prompt=card.prompt,
-                answer=card.answer,
-                explanation=card.explanation,
-                created_at=card.created_at,
-                updated_at=card.updated_at,
-            )
-            for card in deck.cards
-        ],
-        tag_names=[tag.name for tag in deck.tags],
+    media_type = "text/csv" if export_format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        deck_service.export_cards(db, deck.id, export_format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="deck-{deck.id}.{export_format}"'},
     )
 
 
-@router.post("", response_model=DeckRead, status_code=status.HTTP_201_CREATED)
+@router.post("", response_model=DeckRead, status_code=status.HTTP_201_CREATED, response_class=FastJSONResponse)
 def create_deck(
     payload: DeckCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
-) -> DeckRead:
+) -> FastJSONResponse:
     deck = deck_service.create_deck(db, current_user, payload)
-    return DeckRead(
-        id=deck.id,
-        title=deck.title,
-        description=deck.description,
-        is_public=deck.is_public,
-        owner_user_id=deck.owner_user_id,
-        created_at=deck.created_at,
-        updated_at=deck.updated_at,
-        tags=[TagRead(id=tag.id, name=tag.name) for tag in deck.tags],
-        cards=[
-            CardRead(
-                id=card.id,
-                deck_id=card.deck_id,
-                type=card.type,
-                prompt=card.prompt,
-                answer=card.answer,
-                explanation=card.explanation,
-                created_at=card.created_at,
-                updated_at=card.updated_at,
-            )
-            for card in deck.cards
-        ],
-        tag_names=[tag.name for tag in deck.tags],
-    )
+    return FastJSONResponse(deck_service.deck_read_payload(db, deck), status_code=status.HTTP_201_CREATED)
 
 
-@router.put("/{deck_id}", response_model=DeckRead)
+@router.put("/{deck_id}", response_model=DeckRead, response_class=FastJSONResponse)
 def update_deck(
     deck_id: int,
     payload: DeckUpdate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
-) -> DeckRead:
+) -> FastJSONResponse:
     deck = deck_service.get_deck_by_id(db, deck_id)
     if current_user.role != UserRole.ADMIN and deck.owner_user_id != current_user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allowed")
     deck = deck_service.update_deck(db, deck, payload)
-    return DeckRead(
-        id=deck.id,
-        title=deck.title,
-        description=deck.description,
-        is_public=deck.is_public,
-        owner_user_id=deck.owner_user_id,
-        created_at=deck.created_at,
-        updated_at=deck.updated_at,
-        tags=[TagRead(id=tag.id, name=tag.name) for tag in deck.tags],
-        cards=[
-            CardRead(
-                id=card.id,
-                deck_id=card.deck_id,
-                type=card.type,
-                prompt=card.prompt,
-                answer=card.answer,
-                explanation=card.explanation,
-                created_at=card.created_at,
-                updated_at=card.updated_at,
-            )
-            for card in deck.cards
-        ],
-        tag_names=[tag.name for tag in deck.tags],
-    )
+    return FastJSONResponse(deck_service.deck_read_payload(db, deck))
 
 
 @router.delete("/{deck_id}", response_model=Message)
@@ -169,6 +148,25 @@ def add_card(
     )
 
 
+@router.post("/{deck_id}/import", response_model=CardImportResult)
+def import_cards(
+    deck_id: int,
+    file: UploadFile = File(...),
+    import_format: Literal["ndjson", "csv"] = Query(default="ndjson", alias="format"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+) -> CardImportResult:
+    """Bulk-add cards from an uploaded CSV or NDJSON file, reporting rows that fail validation."""
+    deck = deck_service.get_deck_by_id(db, deck_id)
+    if current_user.role != UserRole.ADMIN and deck.owner_user_id != current_user.id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allowed")
+    lines = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        return deck_service.import_cards(db, deck, lines, import_format)
+    except UnicodeDecodeError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="File must be UTF-8 encoded") from exc
+
+
 @router.put("/cards/{card_id}", response_model=CardRead)
 def edit_card(
     card_id: int,
@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Depends
+
+from ...api.deps import get_current_admin
+from ...db.pool_metrics import pool_metrics
+from ...db.session import engine
+from ...models import User
+from ...schemas.metrics import PoolStats, TokenCacheStats
+from ...services.token_cache import token_cache
+
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@router.get("/db-pool", response_model=PoolStats)
+def db_pool_stats(_: User = Depends(get_current_admin)) -> PoolStats:
+    return pool_metrics.snapshot(engine)
+
+
+@router.get("/token-cache", response_model=TokenCacheStats)
+def token_cache_stats(_: User = Depends(get_current_admin)) -> TokenCacheStats:
+    return token_cache.stats()
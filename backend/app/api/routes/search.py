@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends, Query
+from sqlmodel import Session
+
+from ...api.deps import get_current_user_optional
+from ...db.session import get_db
+from ...models import User
+from ...schemas.search import SearchResults, Suggestions
+from ...services import search as search_service
+from ...services.suggest import suggest_index
+
+
+router = APIRouter(tags=["search"])
+
+
+@router.get("/search", response_model=SearchResults)
+def search(
+    q: str = Query(min_length=1, max_length=200, description="Words to look for in decks and cards"),
+    limit: int = Query(default=10, ge=1, le=50, description="Maximum hits per kind"),
+    db: Session = Depends(get_db),
+    current_user: User | None = Depends(get_current_user_optional),
+) -> SearchResults:
+    return search_service.search(db, current_user, q, limit)
+
+
+@router.get("/suggest", response_model=Suggestions)
+def suggest(
+    prefix: str = Query(min_length=1, max_length=100, description="Start of a tag name or deck title"),
+    limit: int = Query(default=10, ge=1, le=25, description="Maximum suggestions per kind"),
+    current_user: User | None = Depends(get_current_user_optional),
+) -> Suggestions:
+    # Served from the in-process index; only user resolution may touch the database.
+    return suggest_index.suggest(prefix, current_user.id if current_user else None, limit)
@@ -1,15 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from ...api.deps import get_current_active_user
-from ...db.session import get_db
-from ...models import Card, QuizSession, User
+from ...api.etag import deck_etag, not_modified
+from ...api.responses import FastJSONResponse
+from ...db.session import get_async_db, get_db
+from ...models import Card, Deck, QuizSession, User
 from ...schemas.card import CardRead
 from ...schemas.common import Message
 from ...schemas.study import (
     ActivityData,
     DueReviewCard,
+    NextDueReview,
+    ReviewForecastDay,
     SessionStatistics,
+    StudyAnswerBatchCreate,
     StudyAnswerCreate,
     StudyAnswerRead,
     StudySessionCreate,
@@ -41,36 +48,26 @@ def read_study_session(
     return StudySessionRead.model_validate(session)
 
 
-@router.get("/sessions/{session_id}/cards")
+@router.get("/sessions/{session_id}/cards", response_class=FastJSONResponse)
 def get_session_cards(
     session_id: int,
+    request: Request,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db),
 ):
-    """Get all cards for a study session"""
-    from fastapi.responses import JSONResponse
+    """Get the cards for a study session: its question_count sample, or the whole deck"""
     from sqlalchemy import select as sa_select
 
     session = study_service.get_session_or_404(db, session_id, current_user)
 
-    # Get cards directly from the database
-    cards = list(db.exec(sa_select(Card).where(Card.deck_id == session.deck_id)).scalars().all())
+    content_version = db.exec(sa_select(Deck.content_version).where(Deck.id == session.deck_id)).scalar_one_or_none()
+    etag = deck_etag(session.id, content_version or 0, session.started_at, scope="session")
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
 
-    # Manually serialize the cards
-    cards_data = []
-    for card in cards:
-        cards_data.append({
-            "id": card.id,
-            "deck_id": card.deck_id,
-            "type": card.type.value if hasattr(card.type, 'value') else card.type,
-            "prompt": card.prompt,
-            "answer": card.answer,
-            "explanation": card.explanation,
-            "created_at": card.created_at.isoformat() if card.created_at else None,
-            "updated_at": card.updated_at.isoformat() if card.updated_at else None,
-        })
-
-    return JSONResponse(content=cards_data)
+    rows = study_service.get_session_cards(db, session)
+    return FastJSONResponse(rows, headers={"ETag": etag})
 
 
 @router.post("/sessions/{session_id}/answer", response_model=StudyAnswerRead)
@@ -79,12 +76,19 @@ async def submit_answer(
     payload: StudyAnswerCreate,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db),
+    async_db: AsyncSession | None = Depends(get_async_db),
 ) -> StudyAnswerRead:
-    session = study_service.get_session_or_404(db, session_id, current_user)
-    card = db.get(Card, payload.card_id)
+    if async_db is not None:
+        session = await study_service.get_session_or_404_async(async_db, session_id, current_user)
+        card = await async_db.get(Card, payload.card_id)
+    else:
+        session = await run_in_threadpool(study_service.get_session_or_404, db, session_id, current_user)
+        card = await run_in_threadpool(db.get, Card, payload.card_id)
     if not card or card.deck_id != session.deck_id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Card not part of session deck")
-    response, llm_feedback = await study_service.record_answer(db, session, card, current_user, payload)
+    response, llm_feedback = await study_service.record_answer(
+        async_db if async_db is not None else db, session, card, current_user, payload
+    )
 
     # Create response dict with LLM feedback
     response_dict = StudyAnswerRead.model_validate(response).model_dump()
@@ -93,6 +97,19 @@ async def submit_answer(
     return StudyAnswerRead(**response_dict)
 
 
+@router.post("/sessions/{session_id}/answers", response_model=list[StudyAnswerRead])
+def submit_answers(
+    session_id: int,
+    payload: StudyAnswerBatchCreate,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db),
+) -> list[StudyAnswerRead]:
+    """Apply an ordered batch of answers (e.g. queued offline) in one transaction."""
+    session = study_service.get_session_or_404(db, session_id, current_user)
+    responses = study_service.record_answers(db, session, current_user, payload.answers)
+    return [StudyAnswerRead.model_validate(response) for response in responses]
+
+
 @router.post("/sessions/{session_id}/finish", response_model=StudySessionRead)
 def finish_session(
     session_id: int,
@@ -117,10 +134,42 @@ def get_session_statistics(
 
 @router.get("/reviews/due", response_model=list[DueReviewCard])
 def get_due_reviews(
+    response: Response,
+    limit: int | None = Query(default=None, ge=1, le=1000),
+    cursor: str | None = Query(default=None, description="Opaque cursor from X-Next-Cursor"),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db),
 ) -> list[DueReviewCard]:
-    return study_service.due_reviews(db, current_user)
+    """List due reviews; with `limit`, the next page's cursor is sent in `X-Next-Cursor`."""
+    reviews, next_cursor = study_service.due_reviews(db, current_user, limit=limit, cursor=cursor)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return reviews
+
+
+@router.get("/reviews/next", response_model=NextDueReview | None)
+def get_next_due_review(
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db),
+) -> NextDueReview | None:
+    """The single most overdue review, or null when nothing is due."""
+    next_due = study_service.next_due_card(db, current_user)
+    if next_due is None:
+        return None
+    due_at, card_id = next_due
+    return NextDueReview(card_id=card_id, due_at=due_at)
+
+
+@router.get("/reviews/forecast", response_model=list[ReviewForecastDay], response_model_exclude_none=True)
+def get_review_forecast(
+    days: int = Query(default=30, ge=1, le=365),
+    deck_id: int | None = Query(default=None, description="Only count reviews of this deck"),
+    by_deck: bool = Query(default=False, description="Split each day's count by deck"),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db),
+) -> list[ReviewForecastDay]:
+    """Per-day due review counts for the next N days; overdue reviews are counted on today."""
+    return study_service.review_forecast(db, current_user, days=days, deck_id=deck_id, by_deck=by_deck)
 
 
 @router.get("/activity", response_model=list[ActivityData])
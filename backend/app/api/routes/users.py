@@ -2,16 +2,18 @@ from datetime import date
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
-from sqlmodel import Session, select
+from sqlmodel import Session
 
 from ...api.deps import get_current_active_user
 from ...db.session import get_db
-from ...models import Deck, User, UserDeckProgress
+from ...models import Deck, User
 from ...schemas.common import Message
 from ...schemas.user import UserRead, UserUpdate, UserSettingsUpdate
-from ...services.auth import hash_password, verify_password
+from ...services.auth import hash_password_async, verify_password_async
 from ...services import streak as streak_service
+from ...services import study as study_service
 
 
 router = APIRouter(prefix="/me", tags=["users"])
@@ -28,16 +30,16 @@ class PasswordChange(BaseModel):
 
 
 @router.put("/password", response_model=Message)
-def change_password(
+async def change_password(
     payload: PasswordChange,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db),
 ) -> Message:
-    if not verify_password(payload.current_password, current_user.hashed_password):
+    if not await verify_password_async(payload.current_password, current_user.hashed_password):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid current password")
-    current_user.hashed_password = hash_password(payload.new_password)
+    current_user.hashed_password = await hash_password_async(payload.new_password)
     db.add(current_user)
-    db.commit()
+    await run_in_threadpool(db.commit)
     return Message(message="Password updated")
 
 
@@ -65,12 +67,7 @@ def toggle_pin_deck(
     deck = db.get(Deck, deck_id)
     if not deck:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Deck not found")
-    progress = db.exec(
-        select(UserDeckProgress).where(UserDeckProgress.user_id == current_user.id, UserDeckProgress.deck_id == deck_id)
-    ).first()
-    if not progress:
-        progress = UserDeckProgress(user_id=current_user.id, deck_id=deck_id, percent_complete=0.0)
-        db.add(progress)
+    progress = study_service.get_or_create_progress(db, current_user, deck_id)
     progress.pinned = payload.pinned
     db.add(progress)
     db.commit()
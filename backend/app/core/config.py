@@ -15,6 +15,17 @@ class Settings(BaseSettings):
     API_V1_STR: str = "/api/v1"
 
     DATABASE_URL: str = "postgresql+psycopg2://flashdecks:flashdecks@db:5432/flashdecks"
+    # Serve the study answer path through an AsyncSession (aiosqlite / async psycopg).
+    ASYNC_DATABASE_ENABLED: bool = False
+    # Defaults to DATABASE_URL with its driver swapped for the async one.
+    ASYNC_DATABASE_URL: Optional[str] = None
+    # Connection pool per engine; size, overflow and timeout do not apply to SQLite.
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 300
+    # Round-trips a SELECT 1 on every checkout to weed out dead connections.
+    DB_POOL_PRE_PING: bool = True
 
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7
@@ -22,6 +33,22 @@ class Settings(BaseSettings):
     JWT_SECRET_KEY: str = "change-me"
     JWT_REFRESH_SECRET_KEY: str = "change-me-too"
     JWT_ALGORITHM: str = "HS256"
+    # Verified token payloads kept in memory until their exp; 0 disables.
+    TOKEN_CACHE_MAX_ENTRIES: int = 4096
+
+    # Argon2id cost (passlib defaults); existing hashes are upgraded on next login when these change.
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST_KIB: int = 65536
+    ARGON2_PARALLELISM: int = 4
+    # Threads dedicated to password hashing, independent of the HTTP threadpool.
+    PASSWORD_HASH_WORKERS: int = 2
+
+    # Process-wide cache of resolved users; off by default. A few seconds (e.g. 30) enables it,
+    # at the cost of other processes' user changes showing up only after the TTL.
+    USER_CACHE_TTL_SECONDS: float = 0.0
+    USER_CACHE_MAX_ENTRIES: int = 1024
+    # Process-local heap of due cards per active user, capped in total entries; 0 disables it.
+    DUE_QUEUE_MAX_ENTRIES: int = 0
 
     CORS_ORIGINS: Union[List[AnyHttpUrl], List[str]] = [
         "http://localhost",
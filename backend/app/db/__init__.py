@@ -1,6 +1,6 @@
 """Database helpers for Flash-Decks."""
 
-from .session import engine, get_db
+from .session import engine, get_async_db, get_db
 
-__all__ = ["engine", "get_db"]
+__all__ = ["engine", "get_async_db", "get_db"]
 
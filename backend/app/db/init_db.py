@@ -1,13 +1,20 @@
 from anyio import to_thread
 from loguru import logger
-from sqlmodel import SQLModel
+from sqlmodel import Session, SQLModel
 
 from ..core.config import settings  # noqa: F401
 from .. import models  # noqa: F401  # ensure models are imported for metadata
+from ..services.suggest import suggest_index
 from .session import engine
 
 
+def _load_suggest_index() -> None:
+    with Session(engine) as session:
+        suggest_index.load(session)
+
+
 async def init_db() -> None:
-    """Create database tables and ensure baseline data exists."""
+    """Create database tables, ensure baseline data exists and warm in-process indexes."""
     logger.info("Initializing database (ensure tables exist)")
     await to_thread.run_sync(SQLModel.metadata.create_all, engine)
+    await to_thread.run_sync(_load_suggest_index)
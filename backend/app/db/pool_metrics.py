@@ -0,0 +1,110 @@
+"""
+Connection pool instrumentation.
+
+``PoolMetrics.attach`` hooks SQLAlchemy pool and engine events to count live
+checkouts, connections opened and invalidated, and pre-ping failures.
+Checkout wait time covers queueing for a free connection plus the pre-ping
+and is timed by the pool class from ``queue_pool_class``, since the pool has
+no event that fires before a checkout starts.
+"""
+import bisect
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+# Upper bounds of the checkout wait histogram buckets, in milliseconds.
+WAIT_BUCKETS_MS = (1.0, 5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 500.0, 1000.0, 2500.0, 5000.0, 10000.0)
+
+
+class PoolMetrics:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.checked_out = 0
+            self.checkouts = 0
+            self.connections_opened = 0
+            self.invalidations = 0
+            self.pre_ping_failures = 0
+            self.wait_counts = [0] * (len(WAIT_BUCKETS_MS) + 1)
+            self.wait_sum_ms = 0.0
+
+    def observe_wait(self, seconds: float) -> None:
+        elapsed_ms = seconds * 1000
+        with self._lock:
+            self.wait_counts[bisect.bisect_left(WAIT_BUCKETS_MS, elapsed_ms)] += 1
+            self.wait_sum_ms += elapsed_ms
+
+    def attach(self, engine: Engine) -> None:
+        """Register the pool and engine listeners that feed these counters."""
+
+        def on_connect(dbapi_connection, connection_record) -> None:
+            with self._lock:
+                self.connections_opened += 1
+
+        def on_checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+            with self._lock:
+                self.checked_out += 1
+                self.checkouts += 1
+
+        def on_checkin(dbapi_connection, connection_record) -> None:
+            with self._lock:
+                self.checked_out -= 1
+
+        def on_invalidate(dbapi_connection, connection_record, exception) -> None:
+            with self._lock:
+                self.invalidations += 1
+
+        def on_error(context) -> None:
+            if context.is_pre_ping:
+                with self._lock:
+                    self.pre_ping_failures += 1
+
+        event.listen(engine.pool, "connect", on_connect)
+        event.listen(engine.pool, "checkout", on_checkout)
+        event.listen(engine.pool, "checkin", on_checkin)
+        event.listen(engine.pool, "invalidate", on_invalidate)
+        event.listen(engine, "handle_error", on_error)
+
+    def snapshot(self, engine: Engine) -> dict:
+        """Current gauges, counters and the cumulative checkout wait histogram for ``engine``."""
+        pool = engine.pool
+        with self._lock:
+            cumulative, buckets = 0, {}
+            for bound, count in zip((*WAIT_BUCKETS_MS, float("inf")), self.wait_counts):
+                cumulative += count
+                buckets["+Inf" if bound == float("inf") else f"{bound:g}"] = cumulative
+            return {
+                "pool_class": type(pool).__name__,
+                "pool_size": pool.size() if isinstance(pool, QueuePool) else None,
+                "overflow": pool.overflow() if isinstance(pool, QueuePool) else None,
+                "idle": pool.checkedin() if isinstance(pool, QueuePool) else None,
+                "checked_out": self.checked_out,
+                "checkouts": self.checkouts,
+                "connections_opened": self.connections_opened,
+                "invalidations": self.invalidations,
+                "pre_ping_failures": self.pre_ping_failures,
+                "checkout_wait_ms": {"buckets": buckets, "count": cumulative, "sum": round(self.wait_sum_ms, 3)},
+            }
+
+    def queue_pool_class(self) -> type[QueuePool]:
+        """A QueuePool subclass that records each checkout's duration here; pass it as ``poolclass``."""
+        metrics = self
+
+        class InstrumentedQueuePool(QueuePool):
+            def connect(self):
+                start = time.perf_counter()
+                try:
+                    return super().connect()
+                finally:
+                    metrics.observe_wait(time.perf_counter() - start)
+
+        return InstrumentedQueuePool
+
+
+pool_metrics = PoolMetrics()
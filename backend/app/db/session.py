@@ -1,23 +1,78 @@
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
+from functools import lru_cache
 
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlmodel import Session, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from ..core.config import settings
+from .pool_metrics import pool_metrics
 
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    pool_pre_ping=True,
-    pool_recycle=300,
-    echo=False,
-)
+def pool_options(url: str) -> dict:
+    """Engine pool arguments from settings; SQLite keeps SQLAlchemy's default pool for its URL."""
+    options = {"pool_pre_ping": settings.DB_POOL_PRE_PING, "pool_recycle": settings.DB_POOL_RECYCLE}
+    if make_url(url).get_backend_name() != "sqlite":
+        options.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+        )
+    return options
+
+
+_engine_options = pool_options(settings.DATABASE_URL)
+if "pool_size" in _engine_options:
+    _engine_options["poolclass"] = pool_metrics.queue_pool_class()
+engine = create_engine(settings.DATABASE_URL, echo=False, **_engine_options)
+pool_metrics.attach(engine)
 
 SessionLocal = sessionmaker(bind=engine, class_=Session, expire_on_commit=False)
 
+# Async drivers for the sync drivers DATABASE_URL may name.
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+psycopg",
+    "postgresql+psycopg": "postgresql+psycopg",
+    "postgresql+psycopg2": "postgresql+psycopg",
+}
+
+
+def async_database_url() -> str:
+    """ASYNC_DATABASE_URL, or DATABASE_URL rewritten to the matching async driver."""
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    url = make_url(settings.DATABASE_URL)
+    return url.set(drivername=ASYNC_DRIVERS.get(url.drivername, url.drivername)).render_as_string(
+        hide_password=False
+    )
+
+
+@lru_cache
+def get_async_engine() -> AsyncEngine:
+    """Create the async engine on first use so sync-only deployments never load async drivers."""
+    url = async_database_url()
+    return create_async_engine(url, echo=False, **pool_options(url))
+
+
+@lru_cache
+def get_async_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(bind=get_async_engine(), class_=AsyncSession, expire_on_commit=False)
+
 
 def get_db() -> Generator[Session, None, None]:
     """FastAPI dependency that yields a database session."""
     with SessionLocal() as session:
         yield session
 
+
+async def get_async_db() -> AsyncGenerator[AsyncSession | None, None]:
+    """FastAPI dependency that yields an AsyncSession, or None unless ASYNC_DATABASE_ENABLED is set."""
+    if not settings.ASYNC_DATABASE_ENABLED:
+        yield None
+        return
+    async with get_async_sessionmaker()() as session:
+        yield session
@@ -3,9 +3,10 @@
 from .card import Card
 from .deck import Deck, DeckTagLink
 from .enums import CardType, QuizMode, QuizStatus, UserRole
-from .study import QuizResponse, QuizSession, SRSReview, UserDeckProgress
+from .study import QuizResponse, QuizSession, SRSReview, UserDailyActivity, UserDeckProgress
 from .tag import Tag
 from .user import User
+from . import search  # noqa: F401  # registers full-text index DDL on the deck and card tables
 
 __all__ = [
     "Card",
@@ -18,6 +19,7 @@ __all__ = [
     "SRSReview",
     "Tag",
     "User",
+    "UserDailyActivity",
     "UserDeckProgress",
     "UserRole",
     "CardType",
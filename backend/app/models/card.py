@@ -2,7 +2,7 @@ from datetime import datetime
 from typing import Optional
 
 from pydantic import ConfigDict
-from sqlalchemy import Column, DateTime, Enum, Text, func
+from sqlalchemy import Column, DateTime, Enum, Index, Text, func
 from sqlmodel import Field, Relationship, SQLModel
 
 from .enums import CardType
@@ -18,6 +18,8 @@ card_type_enum = Enum(
 
 class Card(SQLModel, table=True):
     __tablename__ = "cards"
+    # Serves per-deck id seeks (WHERE deck_id = ? AND id >= ? ORDER BY id) for session sampling.
+    __table_args__ = (Index("ix_cards_deck_id_id", "deck_id", "id"),)
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
     id: Optional[int] = Field(default=None, primary_key=True)
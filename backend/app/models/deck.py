@@ -1,7 +1,7 @@
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional
 
-from sqlalchemy import JSON, Column, DateTime, String, Text, func
+from sqlalchemy import JSON, Column, DateTime, Index, Integer, String, Text, func
 from sqlmodel import Field, Relationship, SQLModel
 
 
@@ -12,8 +12,14 @@ class DeckTagLink(SQLModel, table=True):
     tag_id: Optional[int] = Field(default=None, foreign_key="tags.id", primary_key=True)
 
 
+def _utcnow() -> datetime:
+    return datetime.now(tz=timezone.utc)
+
+
 class Deck(SQLModel, table=True):
     __tablename__ = "decks"
+    # Matches the catalogue ordering (created_at DESC, id DESC) for keyset pages.
+    __table_args__ = (Index("ix_decks_created_at_id", "created_at", "id"),)
 
     id: Optional[int] = Field(default=None, primary_key=True)
     title: str = Field(sa_column=Column(String(255), nullable=False, index=True))
@@ -21,11 +27,16 @@ class Deck(SQLModel, table=True):
     is_public: bool = Field(default=True)
 
     owner_user_id: Optional[int] = Field(default=None, foreign_key="users.id")
+    # Bumped by every deck, tag or card change; drives the deck and session-card ETags.
+    content_version: int = Field(default=1, sa_column=Column(Integer, nullable=False, server_default="1"))
 
+    # Set in Python at microsecond precision so keyset cursors compare exactly;
+    # SQLite's CURRENT_TIMESTAMP default only has whole seconds.
     created_at: datetime = Field(
         sa_column=Column(
             DateTime(timezone=True),
             nullable=False,
+            default=_utcnow,
             server_default=func.now(),
         )
     )
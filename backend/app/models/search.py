@@ -0,0 +1,70 @@
+"""
+Full-text index DDL for decks and cards.
+
+SQLite gets external-content FTS5 tables maintained by triggers; Postgres
+gets a generated ``search_vector`` tsvector column with a GIN index. Either
+way the database keeps the index in sync with every insert, update and
+delete, including Core bulk inserts. The statements run right after
+``create_all`` creates the base tables; migration 0009 applies the same DDL.
+"""
+from sqlalchemy import DDL, event
+
+from .card import Card
+from .deck import Deck
+
+# Indexed text columns per table, in FTS column order.
+SEARCH_COLUMNS = {
+    "decks": ("title", "description"),
+    "cards": ("prompt", "answer", "explanation"),
+}
+
+
+# bm25 column weights for FTS5, matching the A/B/C tsvector weights on Postgres.
+WEIGHTS = ("10.0", "4.0", "1.0")
+
+
+def _sqlite_statements(table: str, columns: tuple[str, ...]) -> list[str]:
+    fts = f"{table}_fts"
+    column_list = ", ".join(columns)
+    new_values = ", ".join(f"new.{column}" for column in columns)
+    old_values = ", ".join(f"old.{column}" for column in columns)
+    insert_new = f"INSERT INTO {fts}(rowid, {column_list}) VALUES (new.id, {new_values});"
+    delete_old = f"INSERT INTO {fts}({fts}, rowid, {column_list}) VALUES ('delete', old.id, {old_values});"
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{column_list}, content='{table}', content_rowid='id', tokenize='porter unicode61')",
+        # Leading columns weigh more: titles/prompts rank above descriptions/answers.
+        f"INSERT INTO {fts}({fts}, rank) VALUES ('rank', 'bm25({', '.join(WEIGHTS[: len(columns)])})')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN {insert_new} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN {delete_old} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {column_list} ON {table} "
+        f"BEGIN {delete_old} {insert_new} END",
+    ]
+
+
+def _postgres_statements(table: str, columns: tuple[str, ...]) -> list[str]:
+    weighted = " || ".join(
+        f"setweight(to_tsvector('english', coalesce({column}, '')), '{weight}')"
+        for column, weight in zip(columns, "ABC")
+    )
+    return [
+        f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        f"GENERATED ALWAYS AS ({weighted}) STORED",
+        f"CREATE INDEX IF NOT EXISTS ix_{table}_search_vector ON {table} USING GIN (search_vector)",
+    ]
+
+
+def search_ddl(dialect: str) -> list[str]:
+    """Every statement that sets up full-text search for ``dialect`` (empty if unsupported)."""
+    build = {"sqlite": _sqlite_statements, "postgresql": _postgres_statements}.get(dialect)
+    if build is None:
+        return []
+    return [statement for table, columns in SEARCH_COLUMNS.items() for statement in build(table, columns)]
+
+
+for _model in (Deck, Card):
+    _table = _model.__table__
+    for _statement in _sqlite_statements(_table.name, SEARCH_COLUMNS[_table.name]):
+        event.listen(_table, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+    for _statement in _postgres_statements(_table.name, SEARCH_COLUMNS[_table.name]):
+        event.listen(_table, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
@@ -1,7 +1,7 @@
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional
 
-from sqlalchemy import Boolean, Column, DateTime, Enum, Float, Integer, JSON, UniqueConstraint, func
+from sqlalchemy import Boolean, Column, Date, DateTime, Enum, Float, Index, Integer, JSON, UniqueConstraint, func
 from sqlmodel import Field, Relationship, SQLModel
 
 from .enums import QuizMode, QuizStatus
@@ -31,6 +31,9 @@ class UserDeckProgress(SQLModel, table=True):
     percent_complete: float = Field(default=0.0)
     last_studied_at: datetime | None = Field(default=None, nullable=True)
     streak: int = Field(default=0)
+    # Running counters maintained by record_answer; rebuild with scripts/rebuild_progress.py.
+    cards_reviewed: int = Field(default=0, sa_column=Column(Integer, nullable=False, server_default="0"))
+    total_cards: int = Field(default=0, sa_column=Column(Integer, nullable=False, server_default="0"))
     pinned: bool = Field(default=False, sa_column=Column(Boolean, nullable=False, server_default='0'))
 
     created_at: datetime = Field(
@@ -70,6 +73,13 @@ class QuizSession(SQLModel, table=True):
     )
     ended_at: datetime | None = Field(default=None, sa_column=Column(DateTime(timezone=True), nullable=True))
     config: dict | None = Field(default=None, sa_column=Column(JSON, nullable=True))
+    # Cards chosen for a question_count-limited session, in presentation order.
+    card_ids: list[int] | None = Field(default=None, sa_column=Column(JSON, nullable=True))
+    # Response counters maintained by record_answer; verify with scripts/check_session_counters.py.
+    total_responses: int = Field(default=0, sa_column=Column(Integer, nullable=False, server_default="0"))
+    correct_count: int = Field(default=0, sa_column=Column(Integer, nullable=False, server_default="0"))
+    incorrect_count: int = Field(default=0, sa_column=Column(Integer, nullable=False, server_default="0"))
+    unanswered_count: int = Field(default=0, sa_column=Column(Integer, nullable=False, server_default="0"))
 
     user: "User" = Relationship(back_populates="quiz_sessions")
     deck: "Deck" = Relationship(back_populates="quiz_sessions")
@@ -81,7 +91,8 @@ class QuizResponse(SQLModel, table=True):
 
     id: Optional[int] = Field(default=None, primary_key=True)
     session_id: int = Field(foreign_key="quiz_sessions.id", nullable=False, index=True)
-    card_id: int = Field(foreign_key="cards.id", nullable=False, index=True)
+    # Null once the card is deleted; the answer stays part of its session's history.
+    card_id: Optional[int] = Field(default=None, foreign_key="cards.id", nullable=True, index=True)
     user_answer: str | None = Field(default=None)
     is_correct: Optional[bool] = Field(default=None, sa_column=Column(Boolean, nullable=True))
     quality: int | None = Field(default=None)
@@ -96,7 +107,11 @@ class QuizResponse(SQLModel, table=True):
 
 class SRSReview(SQLModel, table=True):
     __tablename__ = "srs_reviews"
-    __table_args__ = (UniqueConstraint("user_id", "card_id", name="uq_review_user_card"),)
+    __table_args__ = (
+        UniqueConstraint("user_id", "card_id", name="uq_review_user_card"),
+        # Serves the due queue: WHERE user_id = ? AND due_at <= ? ORDER BY due_at, id.
+        Index("ix_srs_reviews_user_id_due_at", "user_id", "due_at"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: int = Field(foreign_key="users.id", index=True, nullable=False)
@@ -117,6 +132,17 @@ class SRSReview(SQLModel, table=True):
     card: "Card" = Relationship(back_populates="srs_reviews")
 
 
+class UserDailyActivity(SQLModel, table=True):
+    """Per-user, per-UTC-day rollup kept current by finish_session and record_answer."""
+
+    __tablename__ = "user_daily_activity"
+
+    user_id: int = Field(foreign_key="users.id", primary_key=True)
+    activity_date: date = Field(sa_column=Column(Date, primary_key=True))
+    sessions_completed: int = Field(default=0, sa_column=Column(Integer, nullable=False, server_default="0"))
+    answers: int = Field(default=0, sa_column=Column(Integer, nullable=False, server_default="0"))
+    correct: int = Field(default=0, sa_column=Column(Integer, nullable=False, server_default="0"))
+
 from .card import Card  # noqa: E402
 from .deck import Deck  # noqa: E402
 from .user import User  # noqa: E402
@@ -1,11 +1,12 @@
 """Pydantic schemas for API inputs and outputs."""
 
 from .auth import LoginRequest, RefreshRequest, RefreshResponse, SignupRequest, Token
-from .card import CardCreate, CardRead, CardUpdate
+from .card import CardCreate, CardImportError, CardImportResult, CardRead, CardUpdate
 from .common import IDModelMixin, Message, Paginated, TimestampedModel
 from .deck import DeckCreate, DeckRead, DeckSummary, DeckUpdate, TagRead
 from .study import (
     DueReviewCard,
+    StudyAnswerBatchCreate,
     StudyAnswerCreate,
     StudyAnswerRead,
     StudySessionConfig,
@@ -17,6 +18,8 @@ from .user import UserCreate, UserRead, UserUpdate
 
 __all__ = [
     "CardCreate",
+    "CardImportError",
+    "CardImportResult",
     "CardRead",
     "CardUpdate",
     "DeckCreate",
@@ -31,6 +34,7 @@ __all__ = [
     "RefreshRequest",
     "RefreshResponse",
     "SignupRequest",
+    "StudyAnswerBatchCreate",
     "StudyAnswerCreate",
     "StudyAnswerRead",
     "StudySessionConfig",
@@ -32,3 +32,13 @@ class CardRead(CardBase):
     created_at: datetime
     updated_at: datetime
 
+
+class CardImportError(BaseModel):
+    row: int
+    detail: str
+
+
+class CardImportResult(BaseModel):
+    imported: int
+    error_count: int
+    errors: list[CardImportError]
@@ -0,0 +1,30 @@
+from typing import Dict, Optional
+
+from pydantic import BaseModel
+
+
+class CheckoutWaitHistogram(BaseModel):
+    # Cumulative counts keyed by upper bound in milliseconds, ending with "+Inf".
+    buckets: Dict[str, int]
+    count: int
+    sum: float
+
+
+class PoolStats(BaseModel):
+    pool_class: str
+    pool_size: Optional[int] = None
+    overflow: Optional[int] = None
+    idle: Optional[int] = None
+    checked_out: int
+    checkouts: int
+    connections_opened: int
+    invalidations: int
+    pre_ping_failures: int
+    checkout_wait_ms: CheckoutWaitHistogram
+
+
+class TokenCacheStats(BaseModel):
+    hits: int
+    misses: int
+    size: int
+    max_entries: int
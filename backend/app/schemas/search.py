@@ -0,0 +1,34 @@
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class DeckSearchHit(BaseModel):
+    id: int
+    title: str
+    description: Optional[str] = None
+    snippet: str
+    score: float
+
+
+class CardSearchHit(BaseModel):
+    id: int
+    deck_id: int
+    prompt: str
+    snippet: str
+    score: float
+
+
+class SearchResults(BaseModel):
+    decks: List[DeckSearchHit]
+    cards: List[CardSearchHit]
+
+
+class DeckSuggestion(BaseModel):
+    id: int
+    title: str
+
+
+class Suggestions(BaseModel):
+    tags: List[str]
+    decks: List[DeckSuggestion]
@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 from ..models.enums import QuizMode, QuizStatus
 
@@ -42,11 +42,15 @@ class StudyAnswerCreate(BaseModel):
     quality: Optional[int] = None
 
 
+class StudyAnswerBatchCreate(BaseModel):
+    answers: list[StudyAnswerCreate] = Field(min_length=1, max_length=500)
+
+
 class StudyAnswerRead(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
     id: int
-    card_id: int
+    card_id: Optional[int]
     session_id: int
     user_answer: Optional[str]
     is_correct: Optional[bool]
@@ -64,6 +68,22 @@ class DueReviewCard(BaseModel):
     easiness: float
 
 
+class NextDueReview(BaseModel):
+    card_id: int
+    due_at: datetime
+
+
+class ReviewForecastDeck(BaseModel):
+    deck_id: int
+    due_count: int
+
+
+class ReviewForecastDay(BaseModel):
+    date: str
+    due_count: int
+    decks: Optional[list[ReviewForecastDeck]] = None
+
+
 class SessionStatistics(BaseModel):
     total_responses: int
     correct_count: int
@@ -74,3 +94,5 @@ class SessionStatistics(BaseModel):
 class ActivityData(BaseModel):
     date: str
     count: int
+    answers: int = 0
+    correct: int = 0
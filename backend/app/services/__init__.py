@@ -1,4 +1,3 @@
-from . import auth, decks, study
-
-__all__ = ["auth", "decks", "study"]
+from . import activity, auth, decks, search, srs_batch, study, token_cache, user_cache
 
+__all__ = ["activity", "auth", "decks", "search", "srs_batch", "study", "token_cache", "user_cache"]
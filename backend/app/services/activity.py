@@ -0,0 +1,202 @@
+"""
+Per-user daily activity rollup.
+
+``user_daily_activity`` holds one row per user and UTC day. ``finish_session``
+and the answer paths bump it incrementally, so activity charts read at most
+``days`` rows by primary key instead of grouping ``quiz_sessions`` on a
+computed date. ``backfill_daily_activity`` rebuilds it from history.
+"""
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import Integer, bindparam, case, delete, func, insert, literal_column, select, union_all, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+from sqlmodel import Session
+
+from ..models import QuizResponse, QuizSession, QuizStatus, User, UserDailyActivity
+from .pagination import id_chunks
+
+COUNTERS = ("sessions_completed", "answers", "correct")
+DEFAULT_BACKFILL_CHUNK_SIZE = 1000
+
+
+def activity_day(moment: datetime | None = None) -> date:
+    """UTC calendar day of ``moment`` (naive values are taken as UTC), or today."""
+    if moment is None:
+        return datetime.now(tz=timezone.utc).date()
+    if moment.tzinfo:
+        moment = moment.astimezone(timezone.utc)
+    return moment.date()
+
+
+class utc_date(FunctionElement):
+    """
+    SQL counterpart of ``activity_day``: the UTC calendar day of a timestamp.
+
+    Postgres takes ``date()`` of a timestamptz in the session time zone, so
+    the value is shifted to UTC first. SQLite stores UTC already.
+    """
+
+    name = "utc_date"
+    inherit_cache = True
+
+
+@compiles(utc_date)
+def _compile_utc_date(element, compiler, **kw) -> str:
+    return f"date({compiler.process(element.clauses, **kw)})"
+
+
+@compiles(utc_date, "postgresql")
+def _compile_utc_date_postgresql(element, compiler, **kw) -> str:
+    return f"date(timezone('UTC', {compiler.process(element.clauses, **kw)}))"
+
+
+def record_activity(
+    db: Session,
+    user_id: int,
+    day: date,
+    sessions_completed: int = 0,
+    answers: int = 0,
+    correct: int = 0,
+) -> None:
+    """Add to the user's counters for ``day`` with a single upsert in the caller's transaction."""
+    table = UserDailyActivity.__table__
+    values = {
+        "user_id": user_id,
+        "activity_date": day,
+        "sessions_completed": sessions_completed,
+        "answers": answers,
+        "correct": correct,
+    }
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        dialect_insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        stmt = dialect_insert(table).values(values)
+        db.exec(
+            stmt.on_conflict_do_update(
+                index_elements=["user_id", "activity_date"],
+                set_={name: table.c[name] + stmt.excluded[name] for name in COUNTERS},
+            )
+        )
+        return
+
+    result = db.exec(
+        update(table)
+        .where(table.c.user_id == user_id, table.c.activity_date == day)
+        .values({name: table.c[name] + values[name] for name in COUNTERS})
+    )
+    if not result.rowcount:
+        db.exec(insert(table).values(values))
+
+
+def get_daily_activity(db: Session, user: User, days: int = 7) -> list[dict]:
+    """Counters for each of the last ``days`` UTC days, oldest first, zero-filled."""
+    today = activity_day()
+    start = today - timedelta(days=days - 1)
+    rows = {
+        row.activity_date: row
+        for row in db.exec(
+            select(
+                UserDailyActivity.activity_date,
+                UserDailyActivity.sessions_completed,
+                UserDailyActivity.answers,
+                UserDailyActivity.correct,
+            ).where(UserDailyActivity.user_id == user.id, UserDailyActivity.activity_date >= start)
+        )
+    }
+
+    activity = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        row = rows.get(day)
+        activity.append(
+            {
+                "date": str(day),
+                "count": row.sessions_completed if row else 0,
+                "answers": row.answers if row else 0,
+                "correct": row.correct if row else 0,
+            }
+        )
+    return activity
+
+
+def _history_stmt(*session_filters):
+    """Rollup rows for the sessions matching ``session_filters``, aggregated from sessions and responses."""
+    completed = select(
+        QuizSession.user_id.label("user_id"),
+        utc_date(QuizSession.started_at).label("activity_date"),
+        literal_column("1", Integer).label("sessions_completed"),
+        literal_column("0", Integer).label("answers"),
+        literal_column("0", Integer).label("correct"),
+    ).where(QuizSession.status == QuizStatus.COMPLETED, *session_filters)
+    answered = (
+        select(
+            QuizSession.user_id,
+            utc_date(QuizResponse.responded_at),
+            literal_column("0", Integer),
+            literal_column("1", Integer),
+            case((QuizResponse.is_correct.is_(True), 1), else_=0),
+        )
+        .join(QuizSession, QuizSession.id == QuizResponse.session_id)
+        .where(*session_filters)
+    )
+    events = union_all(completed, answered).subquery()
+    return select(
+        events.c.user_id,
+        events.c.activity_date,
+        *(func.sum(events.c[name]) for name in COUNTERS),
+    ).group_by(events.c.user_id, events.c.activity_date)
+
+
+def backfill_daily_activity(db: Session, chunk_size: int = DEFAULT_BACKFILL_CHUNK_SIZE) -> int:
+    """
+    Rebuild the rollup from session and response history.
+
+    Users are processed in id chunks; each chunk's rows are deleted and
+    re-inserted with one INSERT ... SELECT and committed, so the job is
+    idempotent and can be re-run after a partial failure.
+
+    Returns:
+        Number of rollup rows written
+    """
+    written = 0
+    for chunk in id_chunks(db, User.id, chunk_size):
+        first_user_id, last_user_id = chunk[0], chunk[-1]
+        db.exec(delete(UserDailyActivity).where(UserDailyActivity.user_id.between(first_user_id, last_user_id)))
+        result = db.exec(
+            insert(UserDailyActivity).from_select(
+                ["user_id", "activity_date", *COUNTERS],
+                _history_stmt(QuizSession.user_id.between(first_user_id, last_user_id)),
+            )
+        )
+        db.commit()
+        written += max(result.rowcount, 0)
+    return written
+
+
+def remove_deck_activity(db: Session, deck_id: int) -> None:
+    """
+    Take a deck's sessions and answers back out of the rollup before they are deleted.
+
+    Keeps the rollup equal to what ``backfill_daily_activity`` would rebuild
+    from the remaining history. Runs in the caller's transaction.
+    """
+    rows = db.exec(_history_stmt(QuizSession.deck_id == deck_id)).all()
+    if not rows:
+        return
+    table = UserDailyActivity.__table__
+    db.exec(
+        update(table)
+        .where(table.c.user_id == bindparam("row_user_id"), table.c.activity_date == bindparam("row_date"))
+        .values({name: table.c[name] - bindparam(f"row_{name}") for name in COUNTERS}),
+        params=[
+            {
+                "row_user_id": user_id,
+                # SQLite's date() yields ISO strings; Postgres yields dates.
+                "row_date": day if isinstance(day, date) else date.fromisoformat(day),
+                **{f"row_{name}": value for name, value in zip(COUNTERS, counts)},
+            }
+            for user_id, day, *counts in rows
+        ],
+    )
@@ -1,3 +1,5 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Tuple
 
@@ -9,16 +11,41 @@ from sqlmodel import Session, select
 from ..core.config import settings
 from ..models import User, UserRole
 from ..schemas.user import UserCreate
+from .token_cache import token_cache
 
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["argon2"],
+    deprecated="auto",
+    argon2__rounds=settings.ARGON2_TIME_COST,
+    argon2__memory_cost=settings.ARGON2_MEMORY_COST_KIB,
+    argon2__parallelism=settings.ARGON2_PARALLELISM,
+)
+
+# Argon2 releases the GIL, so a small dedicated pool caps how many cores hashing
+# can occupy. Request handlers await the *_async helpers so no request thread
+# waits on a hash; the blocking wrappers are for scripts and one-off bootstrap.
+_hash_executor = ThreadPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="argon2")
 
 
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    return _hash_executor.submit(pwd_context.hash, password).result()
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return _hash_executor.submit(pwd_context.verify, plain_password, hashed_password).result()
+
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, Optional[str]]:
+    """Verify a password and, if its hash uses outdated parameters, return a replacement hash."""
+    return _hash_executor.submit(pwd_context.verify_and_update, plain_password, hashed_password).result()
+
+
+async def hash_password_async(password: str) -> str:
+    return await asyncio.wrap_future(_hash_executor.submit(pwd_context.hash, password))
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await asyncio.wrap_future(_hash_executor.submit(pwd_context.verify, plain_password, hashed_password))
 
 
 def create_access_token(subject: str, expires_delta: Optional[timedelta] = None) -> str:
@@ -38,6 +65,10 @@ def create_refresh_token(subject: str, expires_delta: Optional[timedelta] = None
 
 
 def decode_token(token: str, token_type: str = "access") -> dict:
+    cached = token_cache.get(token, token_type)
+    if cached is not None:
+        return cached
+
     secret = settings.JWT_SECRET_KEY if token_type == "access" else settings.JWT_REFRESH_SECRET_KEY
     try:
         payload = jwt.decode(token, secret, algorithms=[settings.JWT_ALGORITHM])
@@ -45,13 +76,23 @@ def decode_token(token: str, token_type: str = "access") -> dict:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token") from exc
     if payload.get("type") != token_type:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token type")
+    token_cache.put(token, token_type, payload)
     return payload
 
 
 def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
     user = db.exec(select(User).where(User.email == email)).first()
-    if not user or not verify_password(password, user.hashed_password):
+    if not user:
+        return None
+    verified, new_hash = verify_and_update_password(password, user.hashed_password)
+    if not verified:
         return None
+    if new_hash:
+        # Transparently upgrade hashes created with older Argon2 parameters.
+        user.hashed_password = new_hash
+        db.add(user)
+        db.commit()
+        db.refresh(user)
     return user
 
 
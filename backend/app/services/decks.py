@@ -1,33 +1,66 @@
-from collections.abc import Iterable
+import csv
+import io
+import json
+from collections.abc import Iterable, Iterator
 from typing import Tuple
 
 from fastapi import HTTPException, status
-from sqlalchemy import func, select
+from pydantic import ValidationError
+from sqlalchemy import and_, case, delete, exists, func, insert, literal, or_, select, text, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import selectinload
 from sqlmodel import Session
 
-from ..models import Card, CardType, Deck, DeckTagLink, SRSReview, Tag, User, UserDeckProgress
-from ..schemas.card import CardCreate, CardUpdate
+from ..models import (
+    Card,
+    CardType,
+    Deck,
+    DeckTagLink,
+    QuizResponse,
+    QuizSession,
+    SRSReview,
+    Tag,
+    User,
+    UserDeckProgress,
+)
+from ..schemas.card import CardCreate, CardImportError, CardImportResult, CardRead, CardUpdate
 from ..schemas.deck import DeckCreate, DeckRead, DeckSummary, DeckUpdate, TagRead
+from . import activity as activity_service
+from . import pagination
+from .due_queue import due_queue
+from .suggest import suggest_index
+
+
+def _insert_ignoring_conflicts(db: Session, model, rows: list[dict], index_elements: list[str]) -> None:
+    """Bulk INSERT that silently skips rows colliding with a unique index (SQLite and Postgres)."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        stmt = postgresql.insert(model).on_conflict_do_nothing(index_elements=index_elements)
+    elif dialect == "sqlite":
+        stmt = sqlite.insert(model).on_conflict_do_nothing(index_elements=index_elements)
+    else:
+        stmt = insert(model)
+    db.exec(stmt.values(rows))
 
 
 def _resolve_tags(db: Session, tag_names: Iterable[str]) -> list[Tag]:
-    tag_list: list[Tag] = []
-    for name in set(tag_names):
-        name_clean = name.strip()
-        if not name_clean:
-            continue
-        tag = db.exec(select(Tag).where(Tag.name == name_clean)).first()
-        if not tag:
-            tag = Tag(name=name_clean)
-            db.add(tag)
-            db.flush()
-        tag_list.append(tag)
-    return tag_list
+    """Map tag names to Tag rows: one IN lookup, plus one bulk insert and re-read for new names."""
+    names = {name.strip() for name in tag_names} - {""}
+    if not names:
+        return []
+
+    tags = list(db.exec(select(Tag).where(Tag.name.in_(names))).scalars())
+    missing = names - {tag.name for tag in tags}
+    if missing:
+        # Concurrent creators may insert the same names first; the conflict clause absorbs that.
+        _insert_ignoring_conflicts(db, Tag, [{"name": name} for name in sorted(missing)], ["name"])
+        tags.extend(db.exec(select(Tag).where(Tag.name.in_(missing))).scalars())
+    return tags
 
 
 def create_deck(db: Session, owner: User | None, deck_in: DeckCreate) -> Deck:
     tags = _resolve_tags(db, deck_in.tag_names or [])
+    tag_names = [tag.name for tag in tags]
     deck = Deck(
         title=deck_in.title,
         description=deck_in.description,
@@ -39,30 +72,46 @@ def create_deck(db: Session, owner: User | None, deck_in: DeckCreate) -> Deck:
     db.flush()
 
     if deck_in.cards:
-        for card_data in deck_in.cards:
-            card = Card(deck_id=deck.id, **card_data.model_dump(exclude_unset=True))
-            db.add(card)
+        for start in range(0, len(deck_in.cards), IMPORT_CHUNK_SIZE):
+            _insert_cards(db, deck.id, deck_in.cards[start : start + IMPORT_CHUNK_SIZE])
 
     db.commit()
     db.refresh(deck)
+    # Only index after commit so a rolled-back write never surfaces in typeahead.
+    suggest_index.add_tags(tag_names)
+    suggest_index.put_deck(deck)
     return deck
 
 
 def update_deck(db: Session, deck: Deck, deck_in: DeckUpdate) -> Deck:
+    tag_names: list[str] = []
     for field, value in deck_in.model_dump(exclude_unset=True).items():
         if field == "tag_names":
             deck.tags = _resolve_tags(db, value or [])
+            tag_names = [tag.name for tag in deck.tags]
         else:
             setattr(deck, field, value)
     db.add(deck)
+    bump_content_version(db, deck.id)
     db.commit()
     db.refresh(deck)
+    suggest_index.add_tags(tag_names)
+    suggest_index.put_deck(deck)
     return deck
 
 
 def delete_deck(db: Session, deck: Deck) -> None:
+    deck_id = deck.id
+    card_ids = list(db.exec(select(Card.id).where(Card.deck_id == deck_id)).scalars()) if due_queue.enabled else []
+    # The deck's sessions are deleted with it, so their answers leave the activity rollup too.
+    activity_service.remove_deck_activity(db, deck_id)
+    deck_sessions = select(QuizSession.id).where(QuizSession.deck_id == deck_id)
+    db.exec(delete(QuizResponse).where(QuizResponse.session_id.in_(deck_sessions)))
+    db.exec(delete(SRSReview).where(SRSReview.card_id.in_(select(Card.id).where(Card.deck_id == deck_id))))
     db.delete(deck)
     db.commit()
+    suggest_index.remove_deck(deck_id)
+    due_queue.forget_cards(card_ids)
 
 
 def get_deck_by_id(db: Session, deck_id: int) -> Deck:
@@ -72,6 +121,74 @@ def get_deck_by_id(db: Session, deck_id: int) -> Deck:
     return deck
 
 
+DECK_READ_FIELDS = tuple(name for name in DeckRead.model_fields if name not in {"tags", "cards", "tag_names"})
+# Card response fields read straight from columns, in schema order.
+CARD_READ_COLUMNS = tuple(getattr(Card, name) for name in CardRead.model_fields)
+
+
+def deck_read_payload(db: Session, deck: Deck) -> dict:
+    """
+    Build the DeckRead response body for an already loaded deck in two queries.
+
+    Tag and card columns are selected as plain rows and mapped into dicts, so
+    no Card/Tag entities are loaded and no relationship is lazy-loaded. The
+    result is trusted data meant to be returned through FastJSONResponse.
+    """
+    tags = [
+        dict(row)
+        for row in db.exec(
+            select(Tag.id, Tag.name)
+            .join(DeckTagLink, DeckTagLink.tag_id == Tag.id)
+            .where(DeckTagLink.deck_id == deck.id)
+            .order_by(Tag.name)
+        ).mappings()
+    ]
+    cards = [
+        dict(row)
+        for row in db.exec(select(*CARD_READ_COLUMNS).where(Card.deck_id == deck.id).order_by(Card.id)).mappings()
+    ]
+    payload = {name: getattr(deck, name) for name in DECK_READ_FIELDS}
+    return {**payload, "tag_names": [tag["name"] for tag in tags], "tags": tags, "cards": cards}
+
+
+def _summary_columns(user: User | None) -> tuple:
+    """Correlated per-deck aggregates so a whole page of summaries is one statement."""
+    card_count = (
+        select(func.count(Card.id)).where(Card.deck_id == Deck.id).correlate(Deck).scalar_subquery()
+    )
+    if not user:
+        return card_count, literal(0), literal(False)
+    due_count = (
+        select(func.count(SRSReview.id))
+        .join(Card, Card.id == SRSReview.card_id)
+        .where(
+            SRSReview.user_id == user.id,
+            Card.deck_id == Deck.id,
+            SRSReview.due_at <= func.now(),
+        )
+        .correlate(Deck)
+        .scalar_subquery()
+    )
+    pinned = (
+        select(UserDeckProgress.pinned)
+        .where(UserDeckProgress.user_id == user.id, UserDeckProgress.deck_id == Deck.id)
+        .correlate(Deck)
+        .scalar_subquery()
+    )
+    return card_count, due_count, func.coalesce(pinned, False)
+
+
+def _approximate_deck_total(db: Session) -> int:
+    """Planner row estimate for the unfiltered catalogue; falls back to COUNT off Postgres."""
+    if db.get_bind().dialect.name == "postgresql":
+        estimate = db.exec(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'decks'::regclass")
+        ).scalar_one()
+        if estimate >= 0:
+            return int(estimate)
+    return db.exec(select(func.count(Deck.id))).scalar_one()
+
+
 def list_decks(
     db: Session,
     user: User | None,
@@ -79,12 +196,29 @@ def list_decks(
     tag: str | None = None,
     limit: int = 20,
     offset: int = 0,
-) -> tuple[list[DeckSummary], int]:
+    cursor: str | None = None,
+    count_total: bool = True,
+    approximate_total: bool = False,
+) -> tuple[list[DeckSummary], int | None, str | None]:
+    """
+    Page through decks newest first.
+
+    Pages are addressed either by ``offset`` or, when ``cursor`` is given, by
+    the (created_at, id) keyset it encodes. The returned cursor points past
+    the last deck of the page and is None on the final page. The total is
+    only computed when ``count_total`` is set; ``approximate_total`` allows a
+    planner estimate for unfiltered listings.
+    """
+    card_count, due_count, is_pinned = _summary_columns(user)
     deck_stmt = (
-        select(Deck)
-        .options(selectinload(Deck.tags), selectinload(Deck.cards))
-        .offset(offset)
-        .limit(limit)
+        select(
+            Deck,
+            card_count.label("card_count"),
+            due_count.label("due_count"),
+            is_pinned.label("is_pinned"),
+        )
+        .options(selectinload(Deck.tags))
+        .limit(limit + 1)
     )
     count_stmt = select(func.count(Deck.id))
 
@@ -97,51 +231,50 @@ def list_decks(
         deck_stmt = deck_stmt.join(DeckTagLink).join(Tag).where(func.lower(Tag.name) == tag.lower())
         count_stmt = count_stmt.join(DeckTagLink).join(Tag).where(func.lower(Tag.name) == tag.lower())
 
-    deck_stmt = deck_stmt.order_by(Deck.created_at.desc())
+    if cursor:
+        after_created_at, after_id = pagination.decode_cursor(cursor)
+        deck_stmt = deck_stmt.where(
+            or_(
+                Deck.created_at < after_created_at,
+                and_(Deck.created_at == after_created_at, Deck.id < after_id),
+            )
+        )
+    else:
+        deck_stmt = deck_stmt.offset(offset)
+
+    deck_stmt = deck_stmt.order_by(Deck.created_at.desc(), Deck.id.desc())
 
-    decks = db.exec(deck_stmt).scalars().all()
-    total = db.exec(count_stmt).scalar_one()
+    rows = db.exec(deck_stmt).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        # limit=0 still fetches the probe row but returns an empty page with no cursor.
+        if rows:
+            last_deck = rows[-1][0]
+            next_cursor = pagination.encode_cursor(last_deck.created_at, last_deck.id)
+
+    total = None
+    if count_total:
+        if approximate_total and not (search or tag):
+            total = _approximate_deck_total(db)
+        else:
+            total = db.exec(count_stmt).scalar_one()
 
     summaries: list[DeckSummary] = []
-    for deck in decks:
-        tag_reads = [TagRead(id=t.id, name=t.name) for t in deck.tags]
-        due_count = 0
-        is_pinned = False
-        if user:
-            due_count = (
-                db.exec(
-                    select(func.count(SRSReview.id))
-                    .join(Card, Card.id == SRSReview.card_id)
-                    .where(
-                        SRSReview.user_id == user.id,
-                        Card.deck_id == deck.id,
-                        SRSReview.due_at <= func.now(),
-                    )
-                ).scalar_one()
-            )
-            # Check if deck is pinned by user
-            # Use COALESCE to handle NULL/missing values
-            pinned_result = db.exec(
-                select(func.coalesce(UserDeckProgress.pinned, False)).where(
-                    UserDeckProgress.user_id == user.id,
-                    UserDeckProgress.deck_id == deck.id,
-                )
-            ).first()
-            # Convert result to boolean (handles None, 0, False, 1, True)
-            is_pinned = bool(pinned_result) if pinned_result is not None and pinned_result != 0 else False
+    for deck, deck_card_count, deck_due_count, deck_pinned in rows:
         summaries.append(
             DeckSummary(
                 id=deck.id,
                 title=deck.title,
                 description=deck.description,
                 is_public=deck.is_public,
-                card_count=len(deck.cards),
-                due_count=due_count,
-                tags=tag_reads,
-                is_pinned=is_pinned,
+                card_count=int(deck_card_count or 0),
+                due_count=int(deck_due_count or 0),
+                tags=[TagRead(id=t.id, name=t.name) for t in deck.tags],
+                is_pinned=bool(deck_pinned),
             )
         )
-    return summaries, total
+    return summaries, total, next_cursor
 
 
 def _prepare_card_payload(card_in: CardCreate | CardUpdate) -> dict:
@@ -156,10 +289,26 @@ def _prepare_card_payload(card_in: CardCreate | CardUpdate) -> dict:
     return data
 
 
+def bump_content_version(db: Session, deck_id: int) -> None:
+    """Atomically advance the deck's content version, invalidating its ETags."""
+    db.exec(update(Deck).where(Deck.id == deck_id).values(content_version=Deck.content_version + 1))
+
+
+def _adjust_progress_totals(db: Session, deck_id: int, delta: int) -> None:
+    """Shift the cached card total on every progress row for the deck in one UPDATE."""
+    db.exec(
+        update(UserDeckProgress)
+        .where(UserDeckProgress.deck_id == deck_id)
+        .values(total_cards=UserDeckProgress.total_cards + delta)
+    )
+
+
 def attach_card_to_deck(db: Session, deck: Deck, card_in: CardCreate) -> Card:
     payload = _prepare_card_payload(card_in)
     card = Card(deck_id=deck.id, **payload)
     db.add(card)
+    _adjust_progress_totals(db, deck.id, 1)
+    bump_content_version(db, deck.id)
     db.commit()
     db.refresh(card)
     return card
@@ -170,11 +319,166 @@ def update_card(db: Session, card: Card, card_in: CardUpdate) -> Card:
     for key, value in payload.items():
         setattr(card, key, value)
     db.add(card)
+    bump_content_version(db, card.deck_id)
     db.commit()
     db.refresh(card)
     return card
 
 
+def _remove_card_from_progress(db: Session, card: Card) -> None:
+    """
+    Drop a card from every progress row of its deck in one UPDATE.
+
+    The total shrinks by one, ``cards_reviewed`` by one for users who had
+    answered the card, and the percentage is recomputed from both.
+    """
+    answered = exists().where(
+        QuizResponse.card_id == card.id,
+        QuizSession.id == QuizResponse.session_id,
+        QuizSession.user_id == UserDeckProgress.user_id,
+    )
+    total_cards = UserDeckProgress.total_cards - 1
+    cards_reviewed = UserDeckProgress.cards_reviewed - case((answered, 1), else_=0)
+    percent = cards_reviewed * 100.0 / total_cards
+    db.exec(
+        update(UserDeckProgress)
+        .where(UserDeckProgress.deck_id == card.deck_id)
+        .values(
+            total_cards=total_cards,
+            cards_reviewed=cards_reviewed,
+            percent_complete=case((total_cards <= 0, 0.0), (percent > 100.0, 100.0), else_=percent),
+        )
+    )
+
+
 def delete_card(db: Session, card: Card) -> None:
+    _remove_card_from_progress(db, card)
+    bump_content_version(db, card.deck_id)
+    card_id = card.id
+    # Past answers stay with their sessions (keeping session counters and the activity
+    # rollup valid) but no longer point at the card; its scheduling state goes.
+    db.exec(update(QuizResponse).where(QuizResponse.card_id == card_id).values(card_id=None))
+    db.exec(delete(SRSReview).where(SRSReview.card_id == card_id))
     db.delete(card)
     db.commit()
+    due_queue.forget_cards([card_id])
+
+
+EXPORT_BATCH_SIZE = 1000
+EXPORT_FIELDS = ("type", "prompt", "answer", "explanation")
+
+
+def export_cards(db: Session, deck_id: int, export_format: str) -> Iterator[str]:
+    """
+    Stream a deck's cards as NDJSON lines or CSV rows.
+
+    Rows come from a server-side cursor in batches of EXPORT_BATCH_SIZE and
+    each batch is rendered into one text chunk, so memory stays flat no
+    matter how many cards the deck holds. The output round-trips through
+    the card import. The stream reads through its own session on ``db``'s
+    engine, since the response body is sent after the request's session
+    has been closed; that session is closed once the stream ends.
+    """
+    stmt = (
+        select(Card.type, Card.prompt, Card.answer, Card.explanation)
+        .where(Card.deck_id == deck_id)
+        .order_by(Card.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    bind = db.get_bind()
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if export_format == "csv" else None
+    if writer:
+        writer.writerow(EXPORT_FIELDS)
+    with Session(bind) as export_db:
+        for batch in export_db.exec(stmt).partitions():
+            for card_type, prompt, answer, explanation in batch:
+                values = (CardType(card_type).value, prompt, answer, explanation)
+                if writer:
+                    writer.writerow(values)
+                else:
+                    buffer.write(json.dumps(dict(zip(EXPORT_FIELDS, values)), ensure_ascii=False))
+                    buffer.write("\n")
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+IMPORT_CHUNK_SIZE = 500
+MAX_REPORTED_IMPORT_ERRORS = 100
+
+
+def _insert_cards(db: Session, deck_id: int, cards: list[CardCreate]) -> None:
+    """Insert a chunk of validated cards with one multi-row INSERT, bypassing the identity map."""
+    # Every row of a multi-row INSERT needs the same columns, so defaults fill in what was left unset.
+    rows = [{"deck_id": deck_id, **card.model_dump(), **_prepare_card_payload(card)} for card in cards]
+    db.exec(insert(Card).values(rows))
+
+
+def _parse_import_rows(lines: Iterable[str], import_format: str) -> Iterator[tuple[int, dict | None, str | None]]:
+    """Yield (row number, raw fields, parse error) without materialising the file."""
+    if import_format == "csv":
+        for number, record in enumerate(csv.DictReader(lines), start=1):
+            # Blank cells mean "not provided" so optional fields fall back to their defaults.
+            yield number, {key: value for key, value in record.items() if key and value not in ("", None)}, None
+        return
+
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield number, None, f"Invalid JSON: {exc.msg}"
+            continue
+        if not isinstance(record, dict):
+            yield number, None, "Expected a JSON object"
+            continue
+        yield number, record, None
+
+
+def import_cards(db: Session, deck: Deck, lines: Iterable[str], import_format: str) -> CardImportResult:
+    """
+    Validate and insert cards from CSV or NDJSON lines.
+
+    Rows are parsed lazily, validated against CardCreate and inserted in
+    chunks of IMPORT_CHUNK_SIZE, each committed on its own, so memory is
+    bounded by the chunk size rather than the file. Invalid rows are
+    skipped and reported; at most MAX_REPORTED_IMPORT_ERRORS are returned.
+    """
+    imported = 0
+    error_count = 0
+    errors: list[CardImportError] = []
+    chunk: list[CardCreate] = []
+
+    def flush_chunk() -> None:
+        nonlocal imported
+        _insert_cards(db, deck.id, chunk)
+        _adjust_progress_totals(db, deck.id, len(chunk))
+        bump_content_version(db, deck.id)
+        db.commit()
+        imported += len(chunk)
+        chunk.clear()
+
+    for number, record, parse_error in _parse_import_rows(lines, import_format):
+        detail = parse_error
+        if record is not None:
+            try:
+                chunk.append(CardCreate.model_validate(record))
+            except ValidationError as exc:
+                detail = "; ".join(
+                    f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}" for error in exc.errors()
+                )
+        if detail:
+            error_count += 1
+            if len(errors) < MAX_REPORTED_IMPORT_ERRORS:
+                errors.append(CardImportError(row=number, detail=detail))
+        if len(chunk) >= IMPORT_CHUNK_SIZE:
+            flush_chunk()
+
+    if chunk:
+        flush_chunk()
+    return CardImportResult(imported=imported, error_count=error_count, errors=errors)
+
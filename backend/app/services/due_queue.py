@@ -0,0 +1,187 @@
+"""
+Optional process-local priority queue of each active user's due cards.
+
+A user's heap of ``(due_at, card_id)`` is loaded with one query the first
+time it is needed and then kept current by the answer paths, so picking the
+next due card is a heap peek instead of a sorted SQL scan. Rescheduled cards
+push a fresh entry and the superseded one is skipped lazily when it reaches
+the top. Whole users are evicted least-recently-used first once the total
+number of heap entries exceeds ``DUE_QUEUE_MAX_ENTRIES``; 0 disables the
+queue and callers fall back to SQL, as they do for users whose reviews alone
+exceed the cap.
+
+The queue only sees answers recorded by this process, so it suits a single
+worker or sticky sessions; bulk rescheduling calls ``invalidate`` and card
+deletion calls ``forget_cards``.
+"""
+import heapq
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from sqlalchemy import select
+from sqlmodel import Session
+
+from ..core.config import settings
+from ..models import SRSReview
+
+
+def _timestamp(moment: datetime) -> float:
+    """POSIX timestamp of ``moment``; naive values (SQLite) are taken as UTC."""
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+class _UserQueue:
+    __slots__ = ("heap", "due_by_card")
+
+    def __init__(self, rows) -> None:
+        self.due_by_card = {card_id: _timestamp(due_at) for card_id, due_at in rows}
+        self.heap = [(due, card_id) for card_id, due in self.due_by_card.items()]
+        heapq.heapify(self.heap)
+
+    def push(self, card_id: int, due: float) -> None:
+        self.due_by_card[card_id] = due
+        heapq.heappush(self.heap, (due, card_id))
+        # Stale entries are normally dropped at the top; compact if they pile up below it.
+        if len(self.heap) > 2 * len(self.due_by_card) + 64:
+            self.heap = [(due, card_id) for card_id, due in self.due_by_card.items()]
+            heapq.heapify(self.heap)
+
+    def peek(self) -> tuple[float, int] | None:
+        heap = self.heap
+        while heap and self.due_by_card.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+
+class DueQueue:
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._users: OrderedDict[int, _UserQueue] = OrderedDict()
+        self._size = 0
+        # Users whose reviews exceed the cap; they go straight to SQL until invalidated.
+        self._over_cap: set[int] = set()
+        # Reschedules seen while a user's heap is being read, replayed onto it before install;
+        # None marks a load invalidated mid-flight.
+        self._loading: dict[int, list[tuple[int, float]] | None] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def _load(self, db: Session, user_id: int) -> _UserQueue | None:
+        with self._lock:
+            if user_id in self._over_cap:
+                return None
+            queue = self._users.get(user_id)
+            if queue is not None:
+                self._users.move_to_end(user_id)
+                return queue
+            self._loading.setdefault(user_id, [])
+
+        # One row past the cap is enough to know the user does not fit.
+        rows = db.exec(
+            select(SRSReview.card_id, SRSReview.due_at)
+            .where(SRSReview.user_id == user_id)
+            .limit(self.max_entries + 1)
+        ).all()
+        with self._lock:
+            pending = self._loading.pop(user_id, [])
+            if len(rows) > self.max_entries:
+                self._over_cap.add(user_id)
+                return None
+            if user_id not in self._users:
+                if pending is None:
+                    return None
+                queue = _UserQueue(rows)
+                for card_id, due in pending:
+                    queue.push(card_id, due)
+                self._users[user_id] = queue
+                self._size += len(queue.heap)
+                self._evict()
+            return self._users.get(user_id)
+
+    def _evict(self) -> None:
+        while self._size > self.max_entries and self._users:
+            _, queue = self._users.popitem(last=False)
+            self._size -= len(queue.heap)
+
+    def next_due(self, db: Session, user_id: int, now: datetime | None = None) -> tuple[datetime, int] | None:
+        """
+        The user's earliest due (due_at, card_id) if it is due by ``now``.
+
+        Warms the user's heap with one query on first use; afterwards this is
+        a heap peek with no query.
+
+        Raises:
+            LookupError: if the queue is disabled or the user's reviews exceed the cap
+        """
+        if not self.enabled:
+            raise LookupError("Due queue is disabled")
+        queue = self._load(db, user_id)
+        if queue is None:
+            raise LookupError("User has more reviews than the due queue holds")
+        now = now or datetime.now(tz=timezone.utc)
+        with self._lock:
+            before = len(queue.heap)
+            top = queue.peek()
+            self._size -= before - len(queue.heap)
+        if top is None or top[0] > _timestamp(now):
+            return None
+        return datetime.fromtimestamp(top[0], tz=timezone.utc), top[1]
+
+    def record(self, user_id: int, card_id: int, due_at: datetime) -> None:
+        """Apply a rescheduled card to the user's heap if it is loaded."""
+        due = _timestamp(due_at)
+        with self._lock:
+            queue = self._users.get(user_id)
+            if queue is None:
+                pending = self._loading.get(user_id)
+                if pending is not None:
+                    pending.append((card_id, due))
+                return
+            before = len(queue.heap)
+            queue.push(card_id, due)
+            self._size += len(queue.heap) - before
+            self._users.move_to_end(user_id)
+            self._evict()
+
+    def invalidate(self, user_id: int | None = None) -> None:
+        """Drop one user's heap, or everything when no id is given."""
+        with self._lock:
+            if user_id is None:
+                self._users.clear()
+                self._size = 0
+                self._over_cap.clear()
+                for loading_user_id in self._loading:
+                    self._loading[loading_user_id] = None
+                return
+            queue = self._users.pop(user_id, None)
+            if queue is not None:
+                self._size -= len(queue.heap)
+            self._over_cap.discard(user_id)
+            if user_id in self._loading:
+                self._loading[user_id] = None
+
+    def forget_cards(self, card_ids) -> None:
+        """Stop serving deleted cards; their heap entries are skipped and dropped lazily."""
+        card_ids = set(card_ids)
+        if not card_ids:
+            return
+        with self._lock:
+            for queue in self._users.values():
+                for card_id in card_ids & queue.due_by_card.keys():
+                    del queue.due_by_card[card_id]
+            # Heaps still being read may include the deleted cards; don't install them.
+            for loading_user_id in self._loading:
+                self._loading[loading_user_id] = None
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"users": len(self._users), "entries": self._size, "max_entries": self.max_entries}
+
+
+due_queue = DueQueue(settings.DUE_QUEUE_MAX_ENTRIES)
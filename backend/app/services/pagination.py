@@ -0,0 +1,44 @@
+"""Opaque keyset cursors for ``(timestamp, id)`` ordered listings, and keyset id batching."""
+import base64
+import json
+from collections.abc import Iterator
+from datetime import datetime
+
+from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlmodel import Session
+
+
+def encode_cursor(position: datetime, row_id: int) -> str:
+    raw = json.dumps([position.isoformat(), row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        position, row_id = json.loads(raw)
+        return datetime.fromisoformat(position), int(row_id)
+    except (ValueError, TypeError) as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from exc
+
+
+def id_chunks(db: Session, id_column, chunk_size: int) -> Iterator[list[int]]:
+    """
+    Walk a table's ids in ascending chunks of at most ``chunk_size``.
+
+    Each chunk is one ``WHERE id > :last ORDER BY id LIMIT :chunk`` seek, so
+    only the current chunk is held in memory and callers may commit between
+    chunks.
+    """
+    last_id = None
+    while True:
+        stmt = select(id_column).order_by(id_column).limit(chunk_size)
+        if last_id is not None:
+            stmt = stmt.where(id_column > last_id)
+        chunk = list(db.exec(stmt).scalars())
+        if chunk:
+            yield chunk
+        if len(chunk) < chunk_size:
+            return
+        last_id = chunk[-1]
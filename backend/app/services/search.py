@@ -0,0 +1,111 @@
+"""
+Ranked full-text search over decks and cards.
+
+Backed by the FTS5 tables (SQLite) or ``search_vector`` GIN indexes
+(Postgres) declared in ``app.models.search``. Results only include public
+decks and decks owned by the caller; snippets wrap matches in ``<mark>``.
+"""
+import re
+
+from fastapi import HTTPException, status
+from sqlalchemy import text
+from sqlmodel import Session
+
+from ..models import User
+from ..schemas.search import CardSearchHit, DeckSearchHit, SearchResults
+
+SNIPPET_WORDS = 12
+
+_SQLITE_DECKS = text(
+    f"""
+    SELECT decks.id, decks.title, decks.description,
+           snippet(decks_fts, -1, '<mark>', '</mark>', '…', {SNIPPET_WORDS}) AS snippet,
+           -decks_fts.rank AS score
+    FROM decks_fts JOIN decks ON decks.id = decks_fts.rowid
+    WHERE decks_fts MATCH :query AND (decks.is_public OR decks.owner_user_id = :user_id)
+    ORDER BY decks_fts.rank
+    LIMIT :limit
+    """
+)
+
+_SQLITE_CARDS = text(
+    f"""
+    SELECT cards.id, cards.deck_id, cards.prompt,
+           snippet(cards_fts, -1, '<mark>', '</mark>', '…', {SNIPPET_WORDS}) AS snippet,
+           -cards_fts.rank AS score
+    FROM cards_fts
+    JOIN cards ON cards.id = cards_fts.rowid
+    JOIN decks ON decks.id = cards.deck_id
+    WHERE cards_fts MATCH :query AND (decks.is_public OR decks.owner_user_id = :user_id)
+    ORDER BY cards_fts.rank
+    LIMIT :limit
+    """
+)
+
+# Headlines are costly, so they are only built for the ranked top rows.
+_HEADLINE_OPTIONS = f"StartSel=<mark>, StopSel=</mark>, MaxWords={SNIPPET_WORDS}, MinWords=4"
+
+_POSTGRES_DECKS = text(
+    f"""
+    SELECT decks.id, decks.title, decks.description,
+           ts_headline('english', concat_ws(' ', decks.title, decks.description), top.query,
+                       '{_HEADLINE_OPTIONS}') AS snippet,
+           top.score
+    FROM (
+        SELECT decks.id, query, ts_rank_cd(decks.search_vector, query) AS score
+        FROM decks, websearch_to_tsquery('english', :query) AS query
+        WHERE decks.search_vector @@ query AND (decks.is_public OR decks.owner_user_id = :user_id)
+        ORDER BY score DESC
+        LIMIT :limit
+    ) AS top
+    JOIN decks ON decks.id = top.id
+    ORDER BY top.score DESC
+    """
+)
+
+_POSTGRES_CARDS = text(
+    f"""
+    SELECT cards.id, cards.deck_id, cards.prompt,
+           ts_headline('english', concat_ws(' ', cards.prompt, cards.answer, cards.explanation), top.query,
+                       '{_HEADLINE_OPTIONS}') AS snippet,
+           top.score
+    FROM (
+        SELECT cards.id, query, ts_rank_cd(cards.search_vector, query) AS score
+        FROM cards JOIN decks ON decks.id = cards.deck_id, websearch_to_tsquery('english', :query) AS query
+        WHERE cards.search_vector @@ query AND (decks.is_public OR decks.owner_user_id = :user_id)
+        ORDER BY score DESC
+        LIMIT :limit
+    ) AS top
+    JOIN cards ON cards.id = top.id
+    ORDER BY top.score DESC
+    """
+)
+
+
+def _fts5_query(q: str) -> str | None:
+    """Quote each word so user input can't hit FTS5 syntax; the last word matches as a prefix."""
+    terms = re.findall(r"\w+", q)
+    if not terms:
+        return None
+    return " ".join(f'"{term}"' for term in terms) + "*"
+
+
+def search(db: Session, user: User | None, q: str, limit: int = 10) -> SearchResults:
+    """Best-ranked decks and cards matching ``q``, at most ``limit`` of each."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        query = _fts5_query(q)
+        deck_stmt, card_stmt = _SQLITE_DECKS, _SQLITE_CARDS
+    elif dialect == "postgresql":
+        query = q.strip() or None
+        deck_stmt, card_stmt = _POSTGRES_DECKS, _POSTGRES_CARDS
+    else:
+        raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail="Search is not available")
+
+    if query is None:
+        return SearchResults(decks=[], cards=[])
+    params = {"query": query, "user_id": user.id if user else None, "limit": limit}
+    return SearchResults(
+        decks=[DeckSearchHit(**row) for row in db.exec(deck_stmt, params=params).mappings()],
+        cards=[CardSearchHit(**row) for row in db.exec(card_stmt, params=params).mappings()],
+    )
@@ -0,0 +1,155 @@
+"""
+Vectorized SM-2 scheduling for bulk rescheduling and history replay.
+
+The rules mirror ``study._apply_sm2`` exactly (including Python's
+round-half-to-even on the interval), but operate on whole NumPy arrays so
+that millions of reviews can be rescheduled without one ORM update each.
+"""
+from collections.abc import Sequence
+from datetime import datetime, timedelta, timezone
+from typing import NamedTuple
+
+import numpy as np
+from fastapi import HTTPException, status
+from sqlalchemy import select, update
+from sqlmodel import Session
+
+from ..models import SRSReview
+from .due_queue import due_queue
+
+DEFAULT_CHUNK_SIZE = 1000
+NO_ANSWER = -1
+
+
+class SM2State(NamedTuple):
+    repetitions: np.ndarray
+    interval_days: np.ndarray
+    easiness: np.ndarray
+
+
+def _validate_quality(quality: np.ndarray) -> None:
+    if quality.size and (quality.min() < 0 or quality.max() > 5):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Quality must be between 0 and 5")
+
+
+def schedule(
+    repetitions: np.ndarray,
+    interval_days: np.ndarray,
+    easiness: np.ndarray,
+    quality: np.ndarray,
+) -> SM2State:
+    """
+    Apply one SM-2 step to every element of the input arrays.
+
+    Returns:
+        New (repetitions, interval_days, easiness) arrays
+    """
+    repetitions = np.asarray(repetitions, dtype=np.int64)
+    interval_days = np.asarray(interval_days, dtype=np.int64)
+    easiness = np.asarray(easiness, dtype=np.float64)
+    quality = np.asarray(quality, dtype=np.int64)
+    _validate_quality(quality)
+
+    passed = quality >= 3
+    grown = np.maximum(1, np.rint(interval_days * easiness).astype(np.int64))
+
+    new_interval = np.select(
+        [~passed, repetitions == 0, repetitions == 1],
+        [1, 1, 6],
+        default=grown,
+    )
+    new_repetitions = np.where(passed, repetitions + 1, 0)
+
+    lapse = (5 - quality).astype(np.float64)
+    new_easiness = np.maximum(1.3, easiness + (0.1 - lapse * (0.08 + lapse * 0.02)))
+    return SM2State(new_repetitions, new_interval, new_easiness)
+
+
+def replay(quality_matrix: np.ndarray, state: SM2State | None = None) -> SM2State:
+    """
+    Replay answer history column by column.
+
+    ``quality_matrix`` has one row per review and one column per step; cells
+    holding ``NO_ANSWER`` leave that review untouched for the step. Reviews
+    start from the model defaults unless ``state`` is given.
+    """
+    quality_matrix = np.asarray(quality_matrix, dtype=np.int64)
+    rows = quality_matrix.shape[0]
+    if state is None:
+        state = SM2State(
+            np.zeros(rows, dtype=np.int64),
+            np.ones(rows, dtype=np.int64),
+            np.full(rows, 2.5, dtype=np.float64),
+        )
+
+    for column in quality_matrix.T:
+        answered = column != NO_ANSWER
+        if not answered.any():
+            continue
+        stepped = schedule(*state, np.where(answered, column, 5))
+        state = SM2State(*(np.where(answered, new, old) for new, old in zip(stepped, state)))
+    return state
+
+
+def apply_qualities(
+    db: Session,
+    review_ids: Sequence[int],
+    qualities: Sequence[int],
+    now: datetime | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    """
+    Apply one graded answer to each review and persist the results in chunks.
+
+    Each chunk reads only the scheduling columns, computes the new state with
+    ``schedule`` and writes it back with a single executemany UPDATE, then
+    commits so transactions stay bounded.
+
+    Returns:
+        Number of reviews rescheduled
+    """
+    if len(review_ids) != len(qualities):
+        raise ValueError("review_ids and qualities must have the same length")
+    now = now or datetime.now(tz=timezone.utc)
+    _validate_quality(np.asarray(qualities, dtype=np.int64))
+
+    updated = 0
+    for start in range(0, len(review_ids), chunk_size):
+        quality_by_id = dict(zip(review_ids[start : start + chunk_size], qualities[start : start + chunk_size]))
+        rows = db.exec(
+            select(SRSReview.id, SRSReview.repetitions, SRSReview.interval_days, SRSReview.easiness).where(
+                SRSReview.id.in_(quality_by_id)
+            )
+        ).all()
+        if not rows:
+            continue
+
+        ids, repetitions, interval_days, easiness = (np.array(column) for column in zip(*rows))
+        quality = np.array([quality_by_id[review_id] for review_id in ids.tolist()], dtype=np.int64)
+        state = schedule(repetitions, interval_days, easiness, quality)
+
+        db.exec(
+            update(SRSReview),
+            params=[
+                {
+                    "id": review_id,
+                    "repetitions": reps,
+                    "interval_days": interval,
+                    "easiness": ease,
+                    "last_quality": q,
+                    "due_at": now + timedelta(days=interval),
+                }
+                for review_id, reps, interval, ease, q in zip(
+                    ids.tolist(),
+                    state.repetitions.tolist(),
+                    state.interval_days.tolist(),
+                    state.easiness.tolist(),
+                    quality.tolist(),
+                )
+            ],
+        )
+        db.commit()
+        updated += len(rows)
+    # Rows were rewritten without owner ids at hand; cached heaps would be stale.
+    due_queue.invalidate()
+    return updated
@@ -4,11 +4,21 @@ Service for managing user streak tracking.
 A streak represents consecutive days a user has completed at least one quiz.
 If a user misses a day, the streak resets to 1 (not 0, since they're starting fresh).
 """
+import time
+from collections.abc import Iterable
 from datetime import date, datetime, timedelta, timezone
+from itertools import groupby
+from typing import NamedTuple
 
+from sqlalchemy import func, select, update
 from sqlmodel import Session
 
-from ..models import User
+from ..models import QuizSession, QuizStatus, User
+from .activity import utc_date
+from .pagination import id_chunks
+from .user_cache import user_cache
+
+DEFAULT_RECOMPUTE_CHUNK_SIZE = 1000
 
 
 def update_user_streak(db: Session, user: User) -> User:
@@ -77,3 +87,82 @@ def get_streak_stats(user: User) -> dict:
         "last_activity_date": user.last_activity_date,
         "is_active": is_active,
     }
+
+
+class StreakRecomputeStats(NamedTuple):
+    users: int
+    active_users: int
+    seconds: float
+
+    @property
+    def users_per_second(self) -> float:
+        return self.users / self.seconds if self.seconds else 0.0
+
+
+def streaks_from_days(days: Iterable[date]) -> tuple[int, int, date | None]:
+    """
+    Compute (current_streak, longest_streak, last_activity_date) from ascending distinct days.
+
+    ``current_streak`` is the run ending on the last active day, matching what
+    ``update_user_streak`` stores; ``get_streak_stats`` still decides whether
+    it is active today.
+    """
+    current = longest = 0
+    last: date | None = None
+    for day in days:
+        current = current + 1 if last is not None and day == last + timedelta(days=1) else 1
+        longest = max(longest, current)
+        last = day
+    return current, longest, last
+
+
+def _completed_days_stmt(first_user_id: int, last_user_id: int):
+    """Distinct completion days per user in the id range, ordered for a single streaming pass."""
+    day = utc_date(func.coalesce(QuizSession.ended_at, QuizSession.started_at))
+    return (
+        select(QuizSession.user_id, day.label("day"))
+        .where(
+            QuizSession.status == QuizStatus.COMPLETED,
+            QuizSession.user_id.between(first_user_id, last_user_id),
+        )
+        .group_by(QuizSession.user_id, day)
+        .order_by(QuizSession.user_id, day)
+    )
+
+
+def recompute_all_streaks(db: Session, chunk_size: int = DEFAULT_RECOMPUTE_CHUNK_SIZE) -> StreakRecomputeStats:
+    """
+    Rebuild every user's streak columns from completed-session dates.
+
+    Users are processed in id chunks. Each chunk streams its distinct
+    completion days once, ordered by user, and writes all of its users back
+    with one executemany UPDATE before committing, so the job is idempotent
+    and memory stays bounded by the chunk size. Users without completed
+    sessions are reset to no streak.
+    """
+    started = time.perf_counter()
+    users = active_users = 0
+
+    for chunk in id_chunks(db, User.id, chunk_size):
+        users += len(chunk)
+        streaks = {user_id: (0, 0, None) for user_id in chunk}
+        rows = db.exec(_completed_days_stmt(chunk[0], chunk[-1]).execution_options(yield_per=chunk_size))
+        for user_id, user_rows in groupby(rows, key=lambda row: row.user_id):
+            # SQLite's date() yields ISO strings; Postgres yields dates.
+            streaks[user_id] = streaks_from_days(
+                row.day if isinstance(row.day, date) else date.fromisoformat(row.day) for row in user_rows
+            )
+            active_users += 1
+
+        db.exec(
+            update(User),
+            params=[
+                {"id": user_id, "current_streak": current, "longest_streak": longest, "last_activity_date": last}
+                for user_id, (current, longest, last) in streaks.items()
+            ],
+        )
+        db.commit()
+
+    # Bulk UPDATEs bypass the mapper events that normally evict cached users.
+    user_cache.invalidate()
+    return StreakRecomputeStats(users, active_users, time.perf_counter() - started)
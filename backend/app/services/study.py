@@ -1,14 +1,20 @@
 from datetime import datetime, timedelta, timezone
 from typing import Iterable, List, Tuple, Optional, Dict, Any
 import json
+import random
 
+from anyio import to_thread
 from fastapi import HTTPException, status
-from sqlalchemy import func, select
+from sqlalchemy import and_, case, func, or_, select, union_all, update
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from ..models import Card, QuizResponse, QuizSession, SRSReview, User, UserDeckProgress
 from ..models.enums import CardType, QuizMode, QuizStatus
-from ..schemas.study import DueReviewCard, StudyAnswerCreate, StudySessionCreate
+from ..schemas.study import DueReviewCard, ReviewForecastDay, ReviewForecastDeck, StudyAnswerCreate, StudySessionCreate
+from . import activity as activity_service
+from .due_queue import due_queue
+from . import pagination
 from . import streak as streak_service
 
 
@@ -33,13 +39,125 @@ def get_session_or_404(db: Session, session_id: int, user: User) -> QuizSession:
     return session
 
 
-def get_session_cards(db: Session, session: QuizSession) -> list[Card]:
-    """Get all cards for a study session based on the session's deck."""
-    result = db.exec(select(Card).where(Card.deck_id == session.deck_id))
-    return list(result.scalars().all())
+async def get_session_or_404_async(db: AsyncSession, session_id: int, user: User) -> QuizSession:
+    session = await db.get(QuizSession, session_id)
+    if not session or session.user_id != user.id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Session not found")
+    return session
+
+
+# Random id probes issued per wanted new card; extra probes absorb collisions in id gaps.
+SAMPLE_PROBES_PER_CARD = 3
+# Keeps the probe UNION well under SQLite's compound-select limit.
+MAX_SAMPLE_PROBES = 300
+
+
+def _sample_new_cards(db: Session, session: QuizSession, count: int, exclude: set[int]) -> list[int]:
+    """
+    Pick about ``count`` random cards the user has never reviewed, without sorting the deck.
+
+    Draws random pivots inside the deck's id range and, in one UNION ALL
+    query, seeks the first unreviewed card at or after each pivot through
+    ``ix_cards_deck_id_id``. Each probe is an index seek, so the cost grows
+    with ``count`` rather than with the deck size. Cards that follow large id
+    gaps are slightly favoured; if probes collide too often the remainder is
+    filled in id order.
+    """
+    bounds = db.exec(select(func.min(Card.id), func.max(Card.id)).where(Card.deck_id == session.deck_id)).one()
+    if count <= 0 or bounds[0] is None:
+        return []
+    unreviewed = ~select(SRSReview.id).where(
+        SRSReview.user_id == session.user_id, SRSReview.card_id == Card.id
+    ).exists()
+
+    probes = [
+        select(Card.id)
+        .where(Card.deck_id == session.deck_id, Card.id >= random.randint(bounds[0], bounds[1]), unreviewed)
+        .order_by(Card.id)
+        .limit(1)
+        .subquery()
+        .select()
+        for _ in range(min(count * SAMPLE_PROBES_PER_CARD, MAX_SAMPLE_PROBES))
+    ]
+    picked: list[int] = []
+    for card_id in db.exec(union_all(*probes)).scalars():
+        if card_id not in exclude and card_id not in picked:
+            picked.append(card_id)
+            if len(picked) == count:
+                break
+    if len(picked) < count:
+        picked += db.exec(
+            select(Card.id)
+            .where(Card.deck_id == session.deck_id, Card.id.notin_(exclude | set(picked)), unreviewed)
+            .order_by(Card.id)
+            .limit(count - len(picked))
+        ).scalars()
+    random.shuffle(picked)
+    return picked
+
+
+def session_card_ids(db: Session, session: QuizSession) -> list[int] | None:
+    """
+    Card ids for a session limited by ``config.question_count``, chosen once and stored.
+
+    Due reviews come first (oldest first), then a random sample of cards the
+    user has never reviewed, then reviews that are not due yet. Returns None
+    for unlimited sessions, which cover the whole deck.
+    """
+    if session.card_ids is not None:
+        return session.card_ids
+    question_count = (session.config or {}).get("question_count")
+    if not question_count:
+        return None
+
+    reviewed = db.exec(
+        select(SRSReview.card_id, SRSReview.due_at <= func.now())
+        .join(Card, Card.id == SRSReview.card_id)
+        .where(SRSReview.user_id == session.user_id, Card.deck_id == session.deck_id)
+        .order_by(SRSReview.due_at, SRSReview.id)
+        .limit(question_count)
+    ).all()
+    due = [card_id for card_id, is_due in reviewed if is_due]
+    later = [card_id for card_id, is_due in reviewed if not is_due]
+
+    chosen = due + _sample_new_cards(db, session, question_count - len(due), set(due))
+    chosen += later[: question_count - len(chosen)]
+
+    session.card_ids = chosen
+    db.add(session)
+    db.commit()
+    return chosen
+
+
+def get_session_cards(db: Session, session: QuizSession) -> list[dict]:
+    """
+    The cards for a study session: its chosen sample in order, or the whole deck.
+
+    Only the serialized columns are read, as plain rows, so no ORM identity
+    map or model validation is involved.
+    """
+    stmt = select(
+        Card.id,
+        Card.deck_id,
+        Card.type,
+        Card.prompt,
+        Card.answer,
+        Card.explanation,
+        Card.created_at,
+        Card.updated_at,
+    )
+    card_ids = session_card_ids(db, session)
+    if card_ids is None:
+        return [dict(row) for row in db.exec(stmt.where(Card.deck_id == session.deck_id)).mappings()]
+    by_id = {row["id"]: dict(row) for row in db.exec(stmt.where(Card.id.in_(card_ids))).mappings()}
+    return [by_id[card_id] for card_id in card_ids if card_id in by_id]
 
 
 def finish_session(db: Session, session: QuizSession, user: User) -> QuizSession:
+    if session.status != QuizStatus.COMPLETED:
+        activity_service.record_activity(
+            db, user.id, activity_service.activity_day(session.started_at), sessions_completed=1
+        )
     session.status = QuizStatus.COMPLETED
     session.ended_at = datetime.now(tz=timezone.utc)
     db.add(session)
@@ -200,7 +318,7 @@ async def _check_answer_with_llm(card: Card, user_answer: str | None, user: User
 
 
 async def record_answer(
-    db: Session,
+    db: Session | AsyncSession,
     session: QuizSession,
     card: Card,
     user: User,
@@ -209,13 +327,15 @@ async def record_answer(
     """
     Record a user's answer to a card.
 
+    The database work never runs on the event loop: with an AsyncSession it
+    goes through the async driver via ``run_sync``, otherwise it is handed
+    to a worker thread.
+
     Returns:
         Tuple of (QuizResponse, llm_feedback)
     """
     from loguru import logger
 
-    is_correct: bool | None = None
-    quality = answer_in.quality
     llm_feedback: Optional[str] = None
 
     logger.info(f"record_answer: session mode={session.mode}, card type={card.type}")
@@ -224,63 +344,294 @@ async def record_answer(
     # Auto-grading is only for other modes/card types (not applicable in simplified version)
     logger.info(f"Using manual quality rating for {session.mode} mode")
 
+    if isinstance(db, AsyncSession):
+        response = await db.run_sync(_persist_answer, session, card, user, answer_in)
+    else:
+        response = await to_thread.run_sync(_persist_answer, db, session, card, user, answer_in)
+    return response, llm_feedback
+
+
+def _persist_answer(
+    db: Session,
+    session: QuizSession,
+    card: Card,
+    user: User,
+    answer_in: StudyAnswerCreate,
+) -> QuizResponse:
+    quality = answer_in.quality
+    newly_reviewed = int(not _has_answered_card(db, user, card.id))
+
     response = QuizResponse(
         session_id=session.id,
         card_id=card.id,
         user_answer=answer_in.user_answer,
         quality=quality,
-        is_correct=is_correct,
+        is_correct=None,
     )
     db.add(response)
 
+    rescheduled_at = None
     if session.mode == QuizMode.REVIEW and quality is not None:
         review = _get_review_state(db, user, card)
         _apply_sm2(review, quality)
+        rescheduled_at = review.due_at
 
-    _update_progress(db, user, session.deck_id)
+    _update_progress(db, user, session.deck_id, newly_reviewed)
+    _increment_session_counters(db, session.id, [response.is_correct])
+    activity_service.record_activity(
+        db, user.id, activity_service.activity_day(), answers=1, correct=int(bool(response.is_correct))
+    )
 
+    user_id, card_id = user.id, card.id
     db.commit()
+    if rescheduled_at is not None:
+        due_queue.record(user_id, card_id, rescheduled_at)
     db.refresh(response)
-    return response, llm_feedback
+    return response
 
 
-def _update_progress(db: Session, user: User, deck_id: int) -> None:
-    progress = db.exec(
-        select(UserDeckProgress).where(UserDeckProgress.user_id == user.id, UserDeckProgress.deck_id == deck_id)
-    ).scalar_one_or_none()
+def record_answers(
+    db: Session,
+    session: QuizSession,
+    user: User,
+    answers: List[StudyAnswerCreate],
+) -> list[QuizResponse]:
+    """
+    Record an ordered batch of answers in a single transaction.
 
-    if not progress:
-        progress = UserDeckProgress(user_id=user.id, deck_id=deck_id, percent_complete=0.0)
-        db.add(progress)
+    Cards, existing SRS state and previously answered cards are each loaded
+    with one IN query, answers are applied in order, and progress is updated
+    once for the whole batch.
 
-    total_cards = int(db.exec(select(func.count(Card.id)).where(Card.deck_id == deck_id)).scalar_one())
+    Returns:
+        The created QuizResponse rows, in submission order
+    """
+    card_ids = {answer.card_id for answer in answers}
+    cards = {
+        card.id: card
+        for card in db.exec(
+            select(Card).where(Card.id.in_(card_ids), Card.deck_id == session.deck_id)
+        ).scalars()
+    }
+    if len(cards) != len(card_ids):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Card not part of session deck")
+    for answer in answers:
+        if answer.quality is not None and not 0 <= answer.quality <= 5:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Quality must be between 0 and 5")
 
-    reviewed_cards = int(
+    answered_before = set(
         db.exec(
-            select(func.count(QuizResponse.id))
+            select(QuizResponse.card_id)
             .join(QuizSession, QuizSession.id == QuizResponse.session_id)
-            .where(
-                QuizSession.user_id == user.id,
-                QuizSession.deck_id == deck_id,
-            )
-        ).scalar_one()
+            .where(QuizSession.user_id == user.id, QuizResponse.card_id.in_(card_ids))
+            .distinct()
+        ).scalars()
+    )
+    reviews: dict[int, SRSReview] = {}
+    if session.mode == QuizMode.REVIEW:
+        reviews = {
+            review.card_id: review
+            for review in db.exec(
+                select(SRSReview).where(SRSReview.user_id == user.id, SRSReview.card_id.in_(card_ids))
+            ).scalars()
+        }
+
+    responded_at = datetime.now(tz=timezone.utc)
+    responses: list[QuizResponse] = []
+    rescheduled: dict[int, datetime] = {}
+    for answer in answers:
+        response = QuizResponse(
+            session_id=session.id,
+            card_id=answer.card_id,
+            user_answer=answer.user_answer,
+            quality=answer.quality,
+            is_correct=None,
+            responded_at=responded_at,
+        )
+        db.add(response)
+        responses.append(response)
+
+        if session.mode == QuizMode.REVIEW and answer.quality is not None:
+            review = reviews.get(answer.card_id)
+            if review is None:
+                review = SRSReview(user_id=user.id, card_id=answer.card_id)
+                db.add(review)
+                reviews[answer.card_id] = review
+            _apply_sm2(review, answer.quality)
+            rescheduled[answer.card_id] = review.due_at
+
+    _update_progress(db, user, session.deck_id, len(card_ids - answered_before))
+    _increment_session_counters(db, session.id, [response.is_correct for response in responses])
+    activity_service.record_activity(
+        db,
+        user.id,
+        activity_service.activity_day(responded_at),
+        answers=len(responses),
+        correct=sum(bool(response.is_correct) for response in responses),
+    )
+
+    user_id = user.id
+    db.commit()
+    for card_id, due_at in rescheduled.items():
+        due_queue.record(user_id, card_id, due_at)
+    return responses
+
+
+def _increment_session_counters(db: Session, session_id: int, outcomes: List[Optional[bool]]) -> None:
+    """Add graded outcomes to the session's counters with one atomic UPDATE."""
+    db.exec(
+        update(QuizSession)
+        .where(QuizSession.id == session_id)
+        .values(
+            total_responses=QuizSession.total_responses + len(outcomes),
+            correct_count=QuizSession.correct_count + sum(outcome is True for outcome in outcomes),
+            incorrect_count=QuizSession.incorrect_count + sum(outcome is False for outcome in outcomes),
+            unanswered_count=QuizSession.unanswered_count + sum(outcome is None for outcome in outcomes),
+        )
     )
 
-    if total_cards:
-        progress.percent_complete = min(100.0, (reviewed_cards / total_cards) * 100)
-    progress.last_studied_at = datetime.now(tz=timezone.utc)
-    progress.streak = max(progress.streak, 1)
 
+def _has_answered_card(db: Session, user: User, card_id: int) -> bool:
+    """Whether the user has any recorded response for the card (index lookup on card_id)."""
+    return (
+        db.exec(
+            select(QuizResponse.id)
+            .join(QuizSession, QuizSession.id == QuizResponse.session_id)
+            .where(QuizSession.user_id == user.id, QuizResponse.card_id == card_id)
+            .limit(1)
+        ).first()
+        is not None
+    )
+
+
+def _reviewed_cards_stmt(user_id, deck_id):
+    return (
+        select(func.count(func.distinct(QuizResponse.card_id)))
+        .join(QuizSession, QuizSession.id == QuizResponse.session_id)
+        .join(Card, Card.id == QuizResponse.card_id)
+        .where(QuizSession.user_id == user_id, Card.deck_id == deck_id)
+    )
+
+
+def _find_progress(db: Session, user: User, deck_id: int) -> UserDeckProgress | None:
+    return db.exec(
+        select(UserDeckProgress).where(UserDeckProgress.user_id == user.id, UserDeckProgress.deck_id == deck_id)
+    ).scalar_one_or_none()
+
+
+def _create_progress(db: Session, user: User, deck_id: int) -> UserDeckProgress:
+    """Create a progress row with counters seeded from the existing history."""
+    progress = UserDeckProgress(
+        user_id=user.id,
+        deck_id=deck_id,
+        percent_complete=0.0,
+        total_cards=int(db.exec(select(func.count(Card.id)).where(Card.deck_id == deck_id)).scalar_one()),
+        cards_reviewed=int(db.exec(_reviewed_cards_stmt(user.id, deck_id)).scalar_one()),
+    )
     db.add(progress)
+    return progress
+
+
+def get_or_create_progress(db: Session, user: User, deck_id: int) -> UserDeckProgress:
+    return _find_progress(db, user, deck_id) or _create_progress(db, user, deck_id)
+
+
+def _update_progress(db: Session, user: User, deck_id: int, newly_reviewed: int) -> None:
+    """Add newly reviewed cards to the progress row with one atomic UPDATE, creating it on first study."""
+    now = datetime.now(tz=timezone.utc)
+    cards_reviewed = UserDeckProgress.cards_reviewed + newly_reviewed
+    percent = cards_reviewed * 100.0 / UserDeckProgress.total_cards
+    result = db.exec(
+        update(UserDeckProgress)
+        .where(UserDeckProgress.user_id == user.id, UserDeckProgress.deck_id == deck_id)
+        .values(
+            cards_reviewed=cards_reviewed,
+            percent_complete=case(
+                (UserDeckProgress.total_cards <= 0, UserDeckProgress.percent_complete),
+                (percent > 100.0, 100.0),
+                else_=percent,
+            ),
+            last_studied_at=now,
+            streak=case((UserDeckProgress.streak < 1, 1), else_=UserDeckProgress.streak),
+        )
+    )
+    if result.rowcount:
+        return
+
+    # Seeding autoflushes the pending response, so it is already counted.
+    progress = _create_progress(db, user, deck_id)
+    if progress.total_cards:
+        progress.percent_complete = min(100.0, (progress.cards_reviewed / progress.total_cards) * 100)
+    progress.last_studied_at = now
+    progress.streak = max(progress.streak, 1)
 
 
-def due_reviews(db: Session, user: User) -> List[DueReviewCard]:
-    rows = db.exec(
+def rebuild_progress_counters(db: Session) -> int:
+    """
+    Recompute every UserDeckProgress counter from cards and response history.
+
+    Runs as two set-based UPDATE statements regardless of the number of rows.
+
+    Returns:
+        Number of progress rows rewritten
+    """
+    total_cards = (
+        select(func.count(Card.id))
+        .where(Card.deck_id == UserDeckProgress.deck_id)
+        .correlate(UserDeckProgress)
+        .scalar_subquery()
+    )
+    cards_reviewed = (
+        _reviewed_cards_stmt(UserDeckProgress.user_id, UserDeckProgress.deck_id)
+        .correlate(UserDeckProgress)
+        .scalar_subquery()
+    )
+    result = db.exec(update(UserDeckProgress).values(total_cards=total_cards, cards_reviewed=cards_reviewed))
+    percent = UserDeckProgress.cards_reviewed * 100.0 / UserDeckProgress.total_cards
+    db.exec(
+        update(UserDeckProgress)
+        .where(UserDeckProgress.total_cards > 0)
+        .values(percent_complete=case((percent > 100.0, 100.0), else_=percent))
+    )
+    db.commit()
+    return result.rowcount
+
+
+def due_reviews(
+    db: Session,
+    user: User,
+    limit: int | None = None,
+    cursor: str | None = None,
+) -> tuple[List[DueReviewCard], str | None]:
+    """
+    List the user's due reviews ordered by (due_at, id).
+
+    With a ``limit`` the result is one keyset page; the returned cursor
+    resumes after its last row and is None once the queue is exhausted.
+    """
+    stmt = (
         select(SRSReview, Card)
         .join(Card, Card.id == SRSReview.card_id)
         .where(SRSReview.user_id == user.id, SRSReview.due_at <= func.now())
-        .order_by(SRSReview.due_at)
-    ).all()
+        .order_by(SRSReview.due_at, SRSReview.id)
+    )
+    if cursor:
+        after_due_at, after_id = pagination.decode_cursor(cursor)
+        stmt = stmt.where(
+            or_(
+                SRSReview.due_at > after_due_at,
+                and_(SRSReview.due_at == after_due_at, SRSReview.id > after_id),
+            )
+        )
+    if limit is not None:
+        stmt = stmt.limit(limit + 1)
+
+    rows = db.exec(stmt).all()
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        last_review = rows[-1][0]
+        next_cursor = pagination.encode_cursor(last_review.due_at, last_review.id)
 
     results: list[DueReviewCard] = []
     for review, card in rows:
@@ -294,75 +645,143 @@ def due_reviews(db: Session, user: User) -> List[DueReviewCard]:
                 easiness=review.easiness,
             )
         )
-    return results
+    return results, next_cursor
+
+
+def next_due_card(db: Session, user: User) -> Optional[Tuple[datetime, int]]:
+    """
+    The user's earliest due (due_at, card_id), or None when nothing is due.
+
+    Served from the in-memory due queue when it is enabled and holds the
+    user; otherwise one indexed ``ORDER BY due_at LIMIT 1`` query.
+    """
+    try:
+        return due_queue.next_due(db, user.id)
+    except LookupError:
+        pass
+    row = db.exec(
+        select(SRSReview.due_at, SRSReview.card_id)
+        .where(SRSReview.user_id == user.id, SRSReview.due_at <= func.now())
+        .order_by(SRSReview.due_at, SRSReview.id)
+        .limit(1)
+    ).first()
+    return (row.due_at, row.card_id) if row else None
+
+
+def review_forecast(
+    db: Session,
+    user: User,
+    days: int = 30,
+    deck_id: int | None = None,
+    by_deck: bool = False,
+) -> List[ReviewForecastDay]:
+    """
+    Count the user's reviews falling due on each of the next ``days`` UTC days.
+
+    One GROUP BY over the (user_id, due_at) index range computes the counts;
+    reviews that are already overdue are reported on today. ``deck_id``
+    restricts the forecast to one deck and ``by_deck`` adds a per-deck split.
+    """
+    today = datetime.now(tz=timezone.utc).date()
+    end = datetime.combine(today + timedelta(days=days), datetime.min.time(), tzinfo=timezone.utc)
+    due_day = activity_service.utc_date(SRSReview.due_at)
+
+    group_by = [due_day, Card.deck_id] if by_deck else [due_day]
+    stmt = (
+        select(due_day.label("day"), func.count(SRSReview.id).label("due_count"), *group_by[1:])
+        .where(SRSReview.user_id == user.id, SRSReview.due_at < end)
+        .group_by(*group_by)
+    )
+    if deck_id is not None or by_deck:
+        stmt = stmt.join(Card, Card.id == SRSReview.card_id)
+    if deck_id is not None:
+        stmt = stmt.where(Card.deck_id == deck_id)
+    rows = db.exec(stmt).all()
+
+    totals: Dict[str, int] = {}
+    per_deck: Dict[str, Dict[int, int]] = {}
+    for row in rows:
+        # SQLite's date() yields ISO strings; Postgres yields dates.
+        day = max(str(row.day), str(today))
+        totals[day] = totals.get(day, 0) + row.due_count
+        if by_deck:
+            decks = per_deck.setdefault(day, {})
+            decks[row.deck_id] = decks.get(row.deck_id, 0) + row.due_count
+
+    forecast = []
+    for offset in range(days):
+        day = str(today + timedelta(days=offset))
+        decks = None
+        if by_deck:
+            decks = [
+                ReviewForecastDeck(deck_id=forecast_deck_id, due_count=count)
+                for forecast_deck_id, count in sorted(per_deck.get(day, {}).items())
+            ]
+        forecast.append(ReviewForecastDay(date=day, due_count=totals.get(day, 0), decks=decks))
+    return forecast
+
+
+SESSION_COUNTERS = ("total_responses", "correct_count", "incorrect_count", "unanswered_count")
 
 
 def get_session_statistics(db: Session, session: QuizSession) -> dict:
     """
     Get statistics for a quiz session.
 
+    Reads the counters kept on the session row, so loading the session is
+    the only query.
+
     Returns:
         dict with total_responses, correct_count, incorrect_count, unanswered_count
     """
-    from sqlalchemy import func as sql_func, case
+    return {name: getattr(session, name) for name in SESSION_COUNTERS}
 
-    # Query counts directly from database to avoid SQLAlchemy mapper cache issues
-    result = db.exec(
-        select(
-            sql_func.count().label("total"),
-            sql_func.sum(case((QuizResponse.is_correct == True, 1), else_=0)).label("correct"),
-            sql_func.sum(case((QuizResponse.is_correct == False, 1), else_=0)).label("incorrect"),
-            sql_func.sum(case((QuizResponse.is_correct == None, 1), else_=0)).label("unanswered"),
-        ).where(QuizResponse.session_id == session.id)
-    ).first()
+
+def _session_response_counts() -> dict:
+    """Per-session counts recomputed from quiz_responses, correlated to QuizSession."""
+    def counted(condition=None):
+        stmt = select(func.count(QuizResponse.id)).where(QuizResponse.session_id == QuizSession.id)
+        if condition is not None:
+            stmt = stmt.where(condition)
+        return stmt.correlate(QuizSession).scalar_subquery()
 
     return {
-        "total_responses": result.total or 0,
-        "correct_count": result.correct or 0,
-        "incorrect_count": result.incorrect or 0,
-        "unanswered_count": result.unanswered or 0,
+        "total_responses": counted(),
+        "correct_count": counted(QuizResponse.is_correct.is_(True)),
+        "incorrect_count": counted(QuizResponse.is_correct.is_(False)),
+        "unanswered_count": counted(QuizResponse.is_correct.is_(None)),
     }
 
 
-def get_activity_data(db: Session, user: User, days: int = 7) -> List[dict]:
-    """
-    Get quiz activity data for the past N days.
-
-    Returns a list of dicts with date and count of completed quiz sessions.
+def check_session_counters(db: Session, repair: bool = False) -> List[int]:
     """
-    from sqlalchemy import cast, Date
+    Compare every session's counters with its raw responses.
 
-    # Calculate the start date (N days ago)
-    start_date = datetime.now(tz=timezone.utc) - timedelta(days=days - 1)
-    start_of_day = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
+    With ``repair`` the drifted sessions are rewritten from the responses in
+    one set-based UPDATE.
 
-    # Query completed quiz sessions grouped by date
-    # Use func.date() for SQLite compatibility
-    result = db.exec(
-        select(
-            func.date(QuizSession.started_at).label("date"),
-            func.count(QuizSession.id).label("count")
-        )
-        .where(
-            QuizSession.user_id == user.id,
-            QuizSession.status == QuizStatus.COMPLETED,
-            QuizSession.started_at >= start_of_day
-        )
-        .group_by(func.date(QuizSession.started_at))
-        .order_by(func.date(QuizSession.started_at))
-    ).all()
+    Returns:
+        Ids of sessions whose counters did not match
+    """
+    actual = _session_response_counts()
+    drifted = list(
+        db.exec(
+            select(QuizSession.id)
+            .where(or_(*(getattr(QuizSession, name) != actual[name] for name in SESSION_COUNTERS)))
+            .order_by(QuizSession.id)
+        ).scalars()
+    )
+    if repair and drifted:
+        db.exec(update(QuizSession).where(QuizSession.id.in_(drifted)).values(**actual))
+        db.commit()
+    return drifted
 
-    # Create a dict for easy lookup (date is already string from func.date())
-    activity_dict = {row.date: row.count for row in result}
 
-    # Generate data for all days in the range, filling in 0 for days with no activity
-    activity_data = []
-    for i in range(days):
-        date = (datetime.now(tz=timezone.utc) - timedelta(days=days - 1 - i)).date()
-        date_str = str(date)
-        activity_data.append({
-            "date": date_str,
-            "count": activity_dict.get(date_str, 0)
-        })
+def get_activity_data(db: Session, user: User, days: int = 7) -> List[dict]:
+    """
+    Get quiz activity data for the past N days.
 
-    return activity_data
+    Returns a list of dicts with the date, the count of completed quiz
+    sessions and the answers/correct totals, read from the daily rollup.
+    """
+    return activity_service.get_daily_activity(db, user, days)
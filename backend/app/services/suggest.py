@@ -0,0 +1,99 @@
+"""
+Process-local prefix index over tag names and deck titles for typeahead.
+
+Keys are case-folded and kept in sorted lists, so a lookup is a bisect to
+the first key at or after the prefix followed by a short forward scan; no
+query is issued. ``load`` builds the index at startup and the deck service
+keeps it current as decks and tags are written. Like the other process
+caches it only sees writes made by this process.
+"""
+import bisect
+import threading
+
+from sqlalchemy import select
+from sqlmodel import Session
+
+from ..models import Deck, Tag
+
+DEFAULT_SUGGEST_LIMIT = 10
+
+
+class PrefixIndex:
+    def __init__(self) -> None:
+        self._tags: list[tuple[str, str]] = []
+        self._decks: list[tuple[str, int]] = []
+        # deck id -> (key, title, owner_user_id, is_public)
+        self._deck_info: dict[int, tuple[str, str, int | None, bool]] = {}
+        self._lock = threading.Lock()
+
+    def load(self, db: Session) -> None:
+        """Replace the index with every tag and deck currently in the database."""
+        tags = sorted((name.casefold(), name) for name in db.exec(select(Tag.name)).scalars())
+        deck_info = {
+            deck_id: (title.casefold(), title, owner_user_id, is_public)
+            for deck_id, title, owner_user_id, is_public in db.exec(
+                select(Deck.id, Deck.title, Deck.owner_user_id, Deck.is_public)
+            )
+        }
+        decks = sorted((info[0], deck_id) for deck_id, info in deck_info.items())
+        with self._lock:
+            self._tags, self._decks, self._deck_info = tags, decks, deck_info
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tags, self._decks, self._deck_info = [], [], {}
+
+    def add_tags(self, names) -> None:
+        with self._lock:
+            for name in names:
+                entry = (name.casefold(), name)
+                position = bisect.bisect_left(self._tags, entry)
+                if position == len(self._tags) or self._tags[position] != entry:
+                    self._tags.insert(position, entry)
+
+    def put_deck(self, deck: Deck) -> None:
+        """Index a new deck or re-index one whose title or visibility changed."""
+        with self._lock:
+            self._remove_deck(deck.id)
+            key = deck.title.casefold()
+            self._deck_info[deck.id] = (key, deck.title, deck.owner_user_id, deck.is_public)
+            bisect.insort(self._decks, (key, deck.id))
+
+    def remove_deck(self, deck_id: int) -> None:
+        with self._lock:
+            self._remove_deck(deck_id)
+
+    def _remove_deck(self, deck_id: int) -> None:
+        info = self._deck_info.pop(deck_id, None)
+        if info is None:
+            return
+        position = bisect.bisect_left(self._decks, (info[0], deck_id))
+        if position < len(self._decks) and self._decks[position] == (info[0], deck_id):
+            del self._decks[position]
+
+    def suggest(self, prefix: str, user_id: int | None, limit: int = DEFAULT_SUGGEST_LIMIT) -> dict:
+        """
+        Tag names and deck titles starting with ``prefix`` (case-insensitive), alphabetically.
+
+        Decks are limited to public ones and those owned by ``user_id``.
+        """
+        key = prefix.casefold()
+        tags: list[str] = []
+        decks: list[dict] = []
+        with self._lock:
+            position = bisect.bisect_left(self._tags, (key,))
+            while len(tags) < limit and position < len(self._tags) and self._tags[position][0].startswith(key):
+                tags.append(self._tags[position][1])
+                position += 1
+
+            position = bisect.bisect_left(self._decks, (key,))
+            while len(decks) < limit and position < len(self._decks) and self._decks[position][0].startswith(key):
+                deck_id = self._decks[position][1]
+                _, title, owner_user_id, is_public = self._deck_info[deck_id]
+                if is_public or (user_id is not None and owner_user_id == user_id):
+                    decks.append({"id": deck_id, "title": title})
+                position += 1
+        return {"tags": tags, "decks": decks}
+
+
+suggest_index = PrefixIndex()
@@ -0,0 +1,69 @@
+"""
+Bounded LRU cache of verified JWT payloads.
+
+Keys are SHA-256 digests of the raw token (plus its type), so tokens are
+never held in memory verbatim. Each entry expires at the token's own
+``exp`` claim, so a cached token can never outlive its validity.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from ..core.config import settings
+
+
+class TokenCache:
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[bytes, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str, token_type: str) -> bytes:
+        return hashlib.sha256(f"{token_type}:{token}".encode()).digest()
+
+    def get(self, token: str, token_type: str) -> dict | None:
+        key = self._key(token, token_type)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.time():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(entry[1])
+
+    def put(self, token: str, token_type: str, payload: dict) -> None:
+        expires_at = payload.get("exp")
+        if self.max_entries <= 0 or not isinstance(expires_at, (int, float)):
+            return
+        key = self._key(token, token_type)
+        with self._lock:
+            self._entries[key] = (float(expires_at), dict(payload))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+            }
+
+
+token_cache = TokenCache(settings.TOKEN_CACHE_MAX_ENTRIES)
@@ -0,0 +1,82 @@
+"""
+Process-wide short-TTL cache of resolved users.
+
+Entries are detached snapshots; callers re-attach them to their own session
+with ``Session.merge(load=False)``, which costs no query. Any ORM update or
+delete of a User (profile, password, streak changes) evicts its entry.
+Disabled unless USER_CACHE_TTL_SECONDS is set above 0.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import event
+from sqlalchemy.orm import make_transient_to_detached
+
+from ..core.config import settings
+from ..models import User
+
+
+class UserCache:
+    def __init__(self, ttl_seconds: float, max_entries: int) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[int, tuple[float, User]] = OrderedDict()
+        self._default_user_id: tuple[float, int] | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def get(self, user_id: int) -> User | None:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires_at, snapshot = entry
+            if expires_at <= time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return snapshot
+
+    def get_default_user_id(self) -> int | None:
+        with self._lock:
+            if self._default_user_id is None or self._default_user_id[0] <= time.monotonic():
+                return None
+            return self._default_user_id[1]
+
+    def put(self, user: User, default: bool = False) -> None:
+        if not self.enabled or user.id is None:
+            return
+        snapshot = User(**user.model_dump())
+        make_transient_to_detached(snapshot)
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            self._entries[user.id] = (expires_at, snapshot)
+            self._entries.move_to_end(user.id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            if default:
+                self._default_user_id = (expires_at, user.id)
+
+    def invalidate(self, user_id: int | None = None) -> None:
+        """Drop one user's entry, or everything when no id is given."""
+        with self._lock:
+            if user_id is None:
+                self._entries.clear()
+                self._default_user_id = None
+                return
+            self._entries.pop(user_id, None)
+            if self._default_user_id and self._default_user_id[1] == user_id:
+                self._default_user_id = None
+
+
+user_cache = UserCache(settings.USER_CACHE_TTL_SECONDS, settings.USER_CACHE_MAX_ENTRIES)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _evict_changed_user(mapper, connection, target: User) -> None:
+    user_cache.invalidate(target.id)
@@ -0,0 +1,17 @@
+"""Rebuild the user_daily_activity rollup from session and response history."""
+
+from sqlmodel import Session
+
+from app.db.session import engine
+from app.services.activity import backfill_daily_activity
+
+
+def backfill() -> None:
+    """Run the backfill inside a managed session."""
+    with Session(engine) as session:
+        written = backfill_daily_activity(session)
+    print(f"Wrote {written} daily activity rows")
+
+
+if __name__ == "__main__":
+    backfill()
@@ -0,0 +1,40 @@
+"""Report Argon2 hashing throughput for the configured cost parameters."""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core.config import settings
+from app.services.auth import pwd_context
+
+SAMPLES = 32
+
+
+def bench() -> None:
+    """Hash SAMPLES passwords serially and through PASSWORD_HASH_WORKERS threads."""
+    print(
+        f"argon2id t={settings.ARGON2_TIME_COST} m={settings.ARGON2_MEMORY_COST_KIB}KiB "
+        f"p={settings.ARGON2_PARALLELISM} workers={settings.PASSWORD_HASH_WORKERS} cores={os.cpu_count()}"
+    )
+
+    start = time.perf_counter()
+    hashes = [pwd_context.hash(f"password-{i}") for i in range(SAMPLES)]
+    serial = SAMPLES / (time.perf_counter() - start)
+    print(f"hash (1 thread):   {serial:8.1f}/s  ({1000 / serial:.1f} ms each)")
+
+    start = time.perf_counter()
+    for i, hashed in enumerate(hashes):
+        pwd_context.verify(f"password-{i}", hashed)
+    print(f"verify (1 thread): {SAMPLES / (time.perf_counter() - start):8.1f}/s")
+
+    workers = settings.PASSWORD_HASH_WORKERS
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        start = time.perf_counter()
+        list(pool.map(pwd_context.hash, (f"password-{i}" for i in range(SAMPLES))))
+        pooled = SAMPLES / (time.perf_counter() - start)
+    cores_used = min(workers, os.cpu_count() or 1)
+    print(f"hash ({workers} workers): {pooled:8.1f}/s  ({pooled / cores_used:.1f}/s per core)")
+
+
+if __name__ == "__main__":
+    bench()
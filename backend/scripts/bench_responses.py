@@ -0,0 +1,100 @@
+"""Time deck and session-card responses for a large deck, old serialization path against the fast one."""
+
+import sys
+import time
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.api.deps import get_current_active_user, get_current_user_optional
+from app.api.responses import FastJSONResponse
+from app.db.session import get_db
+from app.main import app
+from app.models import Card, Deck, QuizSession, User
+from app.models.enums import QuizMode
+from app.schemas.card import CardRead
+from app.schemas.deck import DeckRead
+from app.services.decks import deck_read_payload
+
+CARD_COUNT = 5000
+ROUNDS = 20
+
+
+def _seed(db: Session, card_count: int) -> tuple[User, Deck, QuizSession]:
+    user = User(email="bench@example.com", hashed_password="x")
+    db.add(user)
+    db.commit()
+    deck = Deck(title="Bench deck", owner_user_id=user.id)
+    db.add(deck)
+    db.commit()
+    db.add_all(
+        Card(deck_id=deck.id, prompt=f"Prompt {i} " * 8, answer=f"Answer {i}", explanation="Because.")
+        for i in range(card_count)
+    )
+    session = QuizSession(user_id=user.id, deck_id=deck.id, mode=QuizMode.REVIEW)
+    db.add(session)
+    db.commit()
+    db.refresh(deck)
+    return user, deck, session
+
+
+def _timed(label: str, fn) -> None:
+    fn()
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        fn()
+    print(f"{label:<48} {(time.perf_counter() - start) / ROUNDS * 1000:8.2f} ms")
+
+
+def _validated_render(deck: Deck) -> bytes:
+    """The previous path: validated models, response_model re-validation, jsonable_encoder, stdlib json."""
+    deck_read = DeckRead(
+        id=deck.id,
+        title=deck.title,
+        description=deck.description,
+        is_public=deck.is_public,
+        owner_user_id=deck.owner_user_id,
+        created_at=deck.created_at,
+        updated_at=deck.updated_at,
+        tags=[],
+        cards=[CardRead.model_validate(card) for card in deck.cards],
+        tag_names=[],
+    )
+    revalidated = DeckRead.model_validate(deck_read.model_dump())
+    return JSONResponse(jsonable_encoder(revalidated)).body
+
+
+def _trusted_render(db: Session, deck: Deck) -> bytes:
+    return FastJSONResponse(deck_read_payload(db, deck)).body
+
+
+def bench(card_count: int = CARD_COUNT) -> None:
+    """Serialize a ``card_count`` deck in-process both ways, then time the real endpoints end to end."""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine)
+
+    with Session(engine) as db:
+        user, deck, session = _seed(db, card_count)
+        print(f"deck with {card_count} cards, mean of {ROUNDS} rounds")
+        _timed("serialize DeckRead (validated, stdlib json)", lambda: _validated_render(deck))
+        _timed("deck_read_payload + FastJSONResponse", lambda: _trusted_render(db, deck))
+
+        app.dependency_overrides[get_db] = lambda: db
+        app.dependency_overrides[get_current_active_user] = lambda: user
+        app.dependency_overrides[get_current_user_optional] = lambda: user
+        try:
+            client = TestClient(app)
+            _timed("GET /decks/{id}", lambda: client.get(f"/api/v1/decks/{deck.id}"))
+            _timed(
+                "GET /study/sessions/{id}/cards",
+                lambda: client.get(f"/api/v1/study/sessions/{session.id}/cards"),
+            )
+        finally:
+            app.dependency_overrides.clear()
+
+
+if __name__ == "__main__":
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else CARD_COUNT)
@@ -0,0 +1,71 @@
+"""Measure search latency percentiles over a generated corpus of cards; the card count is the optional argument."""
+
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import insert
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.models import Card, Deck, User
+from app.models.enums import CardType
+from app.services.search import search
+
+CARD_COUNT = 1_000_000
+QUERIES = 200
+WORDS = [f"term{i}" for i in range(5000)]
+
+
+def _seed(db: Session, card_count: int) -> User:
+    user = User(email="bench@example.com", hashed_password="x")
+    db.add(user)
+    db.commit()
+    deck = Deck(title="Bench deck", owner_user_id=user.id, is_public=True)
+    db.add(deck)
+    db.commit()
+    rng = random.Random(0)
+    for start in range(0, card_count, 10_000):
+        db.exec(
+            insert(Card),
+            params=[
+                {
+                    "deck_id": deck.id,
+                    "type": CardType.BASIC,
+                    "prompt": " ".join(rng.choices(WORDS, k=8)),
+                    "answer": " ".join(rng.choices(WORDS, k=12)),
+                    "explanation": " ".join(rng.choices(WORDS, k=20)),
+                }
+                for _ in range(min(10_000, card_count - start))
+            ],
+        )
+    db.commit()
+    return user
+
+
+def bench(card_count: int = CARD_COUNT) -> None:
+    """Seed ``card_count`` cards into a scratch SQLite file and time random one- and two-word queries."""
+    with tempfile.TemporaryDirectory(prefix="bench_search_") as scratch:
+        engine = create_engine(f"sqlite:///{Path(scratch) / 'bench_search.db'}")
+        SQLModel.metadata.create_all(engine)
+        rng = random.Random(1)
+
+        try:
+            with Session(engine) as db:
+                user = _seed(db, card_count)
+                timings = []
+                for _ in range(QUERIES):
+                    q = " ".join(rng.choices(WORDS, k=rng.randint(1, 2)))
+                    start = time.perf_counter()
+                    search(db, user, q)
+                    timings.append((time.perf_counter() - start) * 1000)
+        finally:
+            engine.dispose()
+
+    quantiles = statistics.quantiles(timings, n=100)
+    print(f"{card_count} cards, {QUERIES} queries: p50 {quantiles[49]:.2f} ms, p95 {quantiles[94]:.2f} ms")
+
+if __name__ == "__main__":
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else CARD_COUNT)
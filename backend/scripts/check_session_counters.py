@@ -0,0 +1,23 @@
+"""Compare QuizSession response counters with quiz_responses; pass --repair to fix drift."""
+
+import sys
+
+from sqlmodel import Session
+
+from app.db.session import engine
+from app.services.study import check_session_counters
+
+
+def check(repair: bool) -> None:
+    """Run the check inside a managed session."""
+    with Session(engine) as session:
+        drifted = check_session_counters(session, repair=repair)
+    if not drifted:
+        print("All session counters match their responses")
+        return
+    action = "Repaired" if repair else "Found"
+    print(f"{action} {len(drifted)} sessions with drifted counters: {drifted[:20]}")
+
+
+if __name__ == "__main__":
+    check(repair="--repair" in sys.argv[1:])
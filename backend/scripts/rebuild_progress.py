@@ -0,0 +1,17 @@
+"""Rebuild the cached UserDeckProgress counters from card and response history."""
+
+from sqlmodel import Session
+
+from app.db.session import engine
+from app.services.study import rebuild_progress_counters
+
+
+def rebuild() -> None:
+    """Run the repair inside a managed session."""
+    with Session(engine) as session:
+        updated = rebuild_progress_counters(session)
+    print(f"Rebuilt progress counters for {updated} rows")
+
+
+if __name__ == "__main__":
+    rebuild()
@@ -5,10 +5,15 @@ from typing import Generator
 
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import event
 from sqlmodel import Session, SQLModel, create_engine
 from sqlmodel.pool import StaticPool
 
 from app.services.auth import create_access_token, hash_password
+from app.services.due_queue import due_queue
+from app.services.suggest import suggest_index
+from app.services.token_cache import token_cache
+from app.services.user_cache import user_cache
 from app.db.session import get_db
 from app.main import app
 from app.models import Card, Deck, QuizResponse, QuizSession, SRSReview, User, UserDeckProgress
@@ -19,6 +24,20 @@ warnings.filterwarnings("ignore", category=ResourceWarning)
 warnings.filterwarnings("ignore", category=DeprecationWarning)
 
 
+@pytest.fixture(autouse=True)
+def clear_process_caches():
+    """Each test gets its own database, so cached users, tokens, due queues and suggestions must not leak between tests."""
+    user_cache.invalidate()
+    token_cache.clear()
+    due_queue.invalidate()
+    suggest_index.clear()
+    yield
+    user_cache.invalidate()
+    token_cache.clear()
+    due_queue.invalidate()
+    suggest_index.clear()
+
+
 @pytest.fixture(name="engine")
 def engine_fixture():
     """Create an in-memory SQLite engine for testing."""
@@ -31,6 +50,19 @@ def engine_fixture():
     return engine
 
 
+@pytest.fixture(name="query_counter")
+def query_counter_fixture(engine):
+    """Record every SQL statement executed against the test engine."""
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    yield statements
+    event.remove(engine, "before_cursor_execute", _record)
+
+
 @pytest.fixture(name="db")
 def db_fixture(engine) -> Generator[Session, None, None]:
     """Create a fresh database session for each test."""
@@ -166,6 +198,21 @@ def test_cards_fixture(db: Session, test_deck: Deck) -> list[Card]:
     return cards
 
 
+@pytest.fixture(name="basic_cards")
+def basic_cards_fixture(db: Session, test_deck: Deck) -> list[Card]:
+    """Create plain BASIC cards for the test deck."""
+    cards = [
+        Card(deck_id=test_deck.id, prompt=f"Question {i}", answer=f"Answer {i}")
+        for i in range(3)
+    ]
+    for card in cards:
+        db.add(card)
+    db.commit()
+    for card in cards:
+        db.refresh(card)
+    return cards
+
+
 @pytest.fixture(name="quiz_session")
 def quiz_session_fixture(db: Session, test_user: User, test_deck: Deck) -> QuizSession:
     """Create a quiz session."""
@@ -1,10 +1,18 @@
 """Tests for deck API endpoints."""
+import csv
+import datetime as dt
+import io
+import json
+
 import pytest
 from fastapi.testclient import TestClient
-from sqlmodel import Session
+from sqlmodel import Session, select
 
-from app.models import Card, Deck, User
+from app.models import Card, Deck, SRSReview, Tag, User, UserDeckProgress
 from app.models.enums import CardType
+from app.schemas.card import CardCreate
+from app.schemas.deck import DeckCreate, DeckRead
+from app.services import decks as deck_service
 
 
 @pytest.mark.integration
@@ -67,6 +75,83 @@ class TestReadDeck:
         response = client.get("/api/v1/decks/999999")
         assert response.status_code == 404
 
+    def test_read_deck_payload_matches_schema(self, client: TestClient, test_deck, basic_cards):
+        response = client.get(f"/api/v1/decks/{test_deck.id}")
+        assert response.status_code == 200
+        deck = DeckRead.model_validate(response.json())
+        assert {card.id for card in deck.cards} == {card.id for card in basic_cards}
+        assert all(card.created_at for card in deck.cards)
+
+    @pytest.mark.parametrize("card_total", [1, 50])
+    def test_read_deck_payload_query_count_is_constant(
+        self, db: Session, test_user: User, query_counter, card_total: int
+    ):
+        deck = deck_service.create_deck(
+            db,
+            test_user,
+            DeckCreate(
+                title="Counted",
+                tag_names=["Zoology", "Anatomy"],
+                cards=[CardCreate(prompt=f"Q{i}", answer=f"A{i}") for i in range(card_total)],
+            ),
+        )
+
+        query_counter.clear()
+        payload = deck_service.deck_read_payload(db, deck)
+        # One query for tags, one for cards; nothing is lazy-loaded.
+        assert len(query_counter) == 2
+        assert payload["tag_names"] == ["Anatomy", "Zoology"]
+        assert len(payload["cards"]) == card_total
+        assert DeckRead.model_validate(payload).title == "Counted"
+
+    def test_read_deck_etag_not_modified(self, client: TestClient, test_deck):
+        response = client.get(f"/api/v1/decks/{test_deck.id}")
+        etag = response.headers["ETag"]
+
+        cached = client.get(f"/api/v1/decks/{test_deck.id}", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.headers["ETag"] == etag
+        assert cached.content == b""
+
+    def test_read_deck_etag_differs_for_recreated_deck_id(self, client: TestClient, db: Session, test_user: User):
+        created_at = dt.datetime(2024, 1, 1, tzinfo=dt.timezone.utc)
+        deck = Deck(title="Original", owner_user_id=test_user.id, is_public=True, created_at=created_at)
+        db.add(deck)
+        db.commit()
+        deck_id = deck.id
+        etag = client.get(f"/api/v1/decks/{deck_id}").headers["ETag"]
+        db.delete(deck)
+        db.commit()
+
+        # SQLite hands the deleted max rowid out again, at the same starting content version.
+        replacement = Deck(
+            title="Replacement",
+            owner_user_id=test_user.id,
+            is_public=True,
+            created_at=created_at + dt.timedelta(seconds=1),
+        )
+        db.add(replacement)
+        db.commit()
+        assert replacement.id == deck_id
+
+        response = client.get(f"/api/v1/decks/{deck_id}", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.json()["title"] == "Replacement"
+
+    def test_read_deck_etag_changes_after_card_added(self, client: TestClient, test_deck, test_user_token):
+        etag = client.get(f"/api/v1/decks/{test_deck.id}").headers["ETag"]
+
+        created = client.post(
+            f"/api/v1/decks/{test_deck.id}/cards",
+            json={"type": "basic", "prompt": "New?", "answer": "Yes"},
+            headers={"Authorization": f"Bearer {test_user_token}"},
+        )
+        assert created.status_code == 201
+
+        response = client.get(f"/api/v1/decks/{test_deck.id}", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+
 
 @pytest.mark.integration
 class TestCreateDeck:
@@ -359,3 +444,204 @@ class TestRemoveCard:
             headers={"Authorization": f"Bearer {test_user_token}"},
         )
         assert response.status_code == 404
+
+
+@pytest.mark.integration
+class TestDeckSummaries:
+    """Test the aggregated summary columns returned by GET /api/v1/decks."""
+
+    def test_list_decks_summary_counts(self, client: TestClient, db: Session, test_user: User, test_deck, basic_cards):
+        db.add(
+            SRSReview(
+                user_id=test_user.id,
+                card_id=basic_cards[0].id,
+                due_at=dt.datetime.now(dt.timezone.utc) - dt.timedelta(days=2),
+            )
+        )
+        db.add(UserDeckProgress(user_id=test_user.id, deck_id=test_deck.id, pinned=True))
+        db.commit()
+
+        response = client.get("/api/v1/decks")
+        assert response.status_code == 200
+        summary = next(deck for deck in response.json() if deck["id"] == test_deck.id)
+        assert summary["card_count"] == 3
+        assert summary["due_count"] == 1
+        assert summary["is_pinned"] is True
+
+    def test_list_decks_query_count_is_constant(self, db: Session, test_user: User, query_counter):
+        for i in range(10):
+            deck = Deck(title=f"Deck {i}", owner_user_id=test_user.id)
+            db.add(deck)
+            db.flush()
+            db.add(Card(deck_id=deck.id, prompt="Q", answer="A"))
+        db.commit()
+        db.refresh(test_user)
+
+        query_counter.clear()
+        summaries, total, _ = deck_service.list_decks(db, test_user, limit=100)
+        assert total == 10
+        assert all(summary.card_count == 1 for summary in summaries)
+        # Page query, tag selectin load and the total count.
+        assert len(query_counter) == 3
+
+    def test_list_decks_keyset_pages(self, client: TestClient, db: Session, test_user: User):
+        base = dt.datetime(2024, 1, 1, tzinfo=dt.timezone.utc)
+        for i in range(7):
+            # Pairs of decks share a timestamp so the id tie-breaker is exercised.
+            db.add(Deck(title=f"Catalogue {i}", owner_user_id=test_user.id, created_at=base + dt.timedelta(hours=i // 2)))
+        db.commit()
+
+        titles: list[str] = []
+        cursor = None
+        while True:
+            params = {"limit": 3} | ({"cursor": cursor} if cursor else {})
+            response = client.get("/api/v1/decks", params=params)
+            assert response.status_code == 200
+            titles.extend(deck["title"] for deck in response.json())
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+
+        assert titles == [f"Catalogue {i}" for i in reversed(range(7))]
+
+    def test_list_decks_keyset_pages_with_default_timestamps(self, client: TestClient):
+        # Decks created through the API in the same second share their server-side created_at second.
+        for i in range(6):
+            assert client.post("/api/v1/decks", json={"title": f"Burst {i}"}).status_code == 201
+
+        titles: list[str] = []
+        cursor = None
+        for _ in range(6):
+            params = {"limit": 2} | ({"cursor": cursor} if cursor else {})
+            response = client.get("/api/v1/decks", params=params)
+            titles.extend(deck["title"] for deck in response.json())
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+
+        assert cursor is None
+        assert titles == [f"Burst {i}" for i in reversed(range(6))]
+
+    def test_list_decks_zero_limit_returns_empty_page(self, client: TestClient, test_deck):
+        response = client.get("/api/v1/decks", params={"limit": 0})
+        assert response.status_code == 200
+        assert response.json() == []
+        assert "X-Next-Cursor" not in response.headers
+
+    def test_list_decks_total_header(self, client: TestClient, test_deck, private_deck):
+        response = client.get("/api/v1/decks", params={"include_total": True, "approximate_total": True})
+        assert response.status_code == 200
+        assert response.headers["X-Total-Count"] == "2"
+        assert "X-Total-Count" not in client.get("/api/v1/decks").headers
+
+
+@pytest.mark.integration
+class TestExportDeck:
+    """Test GET /api/v1/decks/{deck_id}/export endpoint."""
+
+    def test_export_ndjson(self, client: TestClient, test_deck, basic_cards):
+        response = client.get(f"/api/v1/decks/{test_deck.id}/export")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert rows == [
+            {"type": "basic", "prompt": f"Question {i}", "answer": f"Answer {i}", "explanation": None}
+            for i in range(3)
+        ]
+
+    def test_export_csv_spans_batches(self, client: TestClient, db: Session, test_deck, monkeypatch):
+        monkeypatch.setattr(deck_service, "EXPORT_BATCH_SIZE", 2)
+        for i in range(5):
+            db.add(Card(deck_id=test_deck.id, prompt=f"Prompt, {i}", answer="A"))
+        db.commit()
+
+        response = client.get(f"/api/v1/decks/{test_deck.id}/export", params={"format": "csv"})
+        assert response.status_code == 200
+        rows = list(csv.reader(io.StringIO(response.text)))
+        assert rows[0] == ["type", "prompt", "answer", "explanation"]
+        assert [row[1] for row in rows[1:]] == [f"Prompt, {i}" for i in range(5)]
+
+    def test_export_leaves_request_session_open(self, client: TestClient, db: Session, test_deck, basic_cards):
+        response = client.get(f"/api/v1/decks/{test_deck.id}/export")
+        assert response.status_code == 200
+        # The stream uses its own session; the request's session is left to its dependency.
+        assert test_deck in db
+
+    def test_export_rejects_unknown_format(self, client: TestClient, test_deck):
+        response = client.get(f"/api/v1/decks/{test_deck.id}/export", params={"format": "xml"})
+        assert response.status_code == 422
+
+
+@pytest.mark.integration
+class TestImportCards:
+    """Test POST /api/v1/decks/{deck_id}/import endpoint."""
+
+    def test_import_ndjson_reports_bad_rows(self, client: TestClient, db: Session, test_deck, monkeypatch):
+        monkeypatch.setattr(deck_service, "IMPORT_CHUNK_SIZE", 2)
+        lines = [
+            json.dumps({"prompt": "P1", "answer": "A1"}),
+            "{not json",
+            json.dumps({"prompt": "P2"}),
+            "",
+            json.dumps({"prompt": "P3", "answer": "A3", "explanation": "E3"}),
+            json.dumps({"prompt": "P4", "answer": "A4", "type": "basic"}),
+            json.dumps(["P5", "A5"]),
+        ]
+        response = client.post(
+            f"/api/v1/decks/{test_deck.id}/import",
+            files={"file": ("cards.ndjson", "\n".join(lines), "application/x-ndjson")},
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["imported"] == 3
+        assert data["error_count"] == 3
+        assert [error["row"] for error in data["errors"]] == [2, 3, 7]
+        assert "answer" in data["errors"][1]["detail"]
+
+        prompts = db.exec(select(Card.prompt).where(Card.deck_id == test_deck.id).order_by(Card.id)).all()
+        assert prompts == ["P1", "P3", "P4"]
+
+    def test_import_round_trips_csv_export(self, client: TestClient, db: Session, test_deck, test_user, basic_cards):
+        exported = client.get(f"/api/v1/decks/{test_deck.id}/export", params={"format": "csv"}).text
+        target = Deck(title="Copy", owner_user_id=test_user.id)
+        db.add(target)
+        db.commit()
+        db.refresh(target)
+
+        response = client.post(
+            f"/api/v1/decks/{target.id}/import",
+            params={"format": "csv"},
+            files={"file": ("cards.csv", exported, "text/csv")},
+        )
+        assert response.status_code == 200
+        assert response.json() == {"imported": 3, "error_count": 0, "errors": []}
+        copied = db.exec(select(Card).where(Card.deck_id == target.id).order_by(Card.id)).all()
+        assert [(card.prompt, card.answer, card.explanation) for card in copied] == [
+            (card.prompt, card.answer, card.explanation) for card in basic_cards
+        ]
+
+
+@pytest.mark.integration
+class TestTagResolution:
+    """Test set-based tag resolution used by deck create/update."""
+
+    def test_resolve_tags_reuses_and_creates(self, db: Session, query_counter):
+        db.add(Tag(name="Biology"))
+        db.commit()
+
+        query_counter.clear()
+        tags = deck_service._resolve_tags(db, ["Biology", " Chemistry ", "Chemistry", "", "Physics"])
+        assert sorted(tag.name for tag in tags) == ["Biology", "Chemistry", "Physics"]
+        assert all(tag.id for tag in tags)
+        # Existing lookup, one bulk insert, one re-read of the new names.
+        assert len(query_counter) == 3
+
+    def test_resolve_tags_tolerates_concurrent_insert(self, db: Session):
+        deck_service._insert_ignoring_conflicts(db, Tag, [{"name": "Languages"}], ["name"])
+        deck_service._insert_ignoring_conflicts(db, Tag, [{"name": "Languages"}, {"name": "Math"}], ["name"])
+        assert sorted(db.exec(select(Tag.name)).all()) == ["Languages", "Math"]
+
+    def test_create_deck_with_tags(self, client: TestClient):
+        response = client.post("/api/v1/decks", json={"title": "Tagged", "tag_names": ["a", "b", "a "]})
+        assert response.status_code == 201
+        assert sorted(response.json()["tag_names"]) == ["a", "b"]
@@ -1,8 +1,14 @@
 """Tests for study/quiz API endpoints."""
+import datetime as dt
+
 import pytest
 from fastapi.testclient import TestClient
+from sqlmodel import select
 
+from app.models import QuizResponse, QuizSession
 from app.models.enums import QuizMode
+from app.services import activity as activity_service
+from app.services import study as study_service
 
 
 @pytest.mark.integration
@@ -59,6 +65,94 @@ class TestStartSession:
         assert response.status_code in [201, 404]
 
 
+@pytest.mark.integration
+class TestSessionCardSampling:
+    """Test question_count-limited card selection for GET /api/v1/study/sessions/{id}/cards."""
+
+    def _deck_cards(self, db, test_deck, count: int) -> list[int]:
+        from app.models import Card
+
+        cards = [Card(deck_id=test_deck.id, prompt=f"Q{i}", answer="A") for i in range(count)]
+        db.add_all(cards)
+        db.commit()
+        return [card.id for card in cards]
+
+    def _start(self, client: TestClient, test_deck, token: str, question_count: int | None) -> int:
+        config = {"question_count": question_count} if question_count else None
+        response = client.post(
+            "/api/v1/study/sessions",
+            json={"deck_id": test_deck.id, "mode": "review", "config": config},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        assert response.status_code == 201
+        return response.json()["id"]
+
+    def test_question_count_limits_and_is_reused(
+        self, client: TestClient, db, test_deck, test_user_token, query_counter
+    ):
+        card_ids = self._deck_cards(db, test_deck, 30)
+        session_id = self._start(client, test_deck, test_user_token, 5)
+        headers = {"Authorization": f"Bearer {test_user_token}"}
+
+        query_counter.clear()
+        first = [card["id"] for card in client.get(f"/api/v1/study/sessions/{session_id}/cards", headers=headers).json()]
+        assert len(first) == len(set(first)) == 5
+        assert set(first) <= set(card_ids)
+        assert not [statement for statement in query_counter if "random()" in statement.lower()]
+
+        again = [card["id"] for card in client.get(f"/api/v1/study/sessions/{session_id}/cards", headers=headers).json()]
+        assert again == first
+        assert db.get(QuizSession, session_id).card_ids == first
+
+    def test_due_cards_first_then_new_cards(self, client: TestClient, db, test_user, test_deck, test_user_token):
+        from app.models import SRSReview
+
+        card_ids = self._deck_cards(db, test_deck, 12)
+        now = dt.datetime.now(dt.timezone.utc)
+        db.add(SRSReview(user_id=test_user.id, card_id=card_ids[5], due_at=now - dt.timedelta(days=1)))
+        db.add(SRSReview(user_id=test_user.id, card_id=card_ids[3], due_at=now - dt.timedelta(days=3)))
+        db.add(SRSReview(user_id=test_user.id, card_id=card_ids[0], due_at=now + dt.timedelta(days=9)))
+        db.commit()
+
+        session_id = self._start(client, test_deck, test_user_token, 6)
+        cards = client.get(
+            f"/api/v1/study/sessions/{session_id}/cards",
+            headers={"Authorization": f"Bearer {test_user_token}"},
+        ).json()
+        chosen = [card["id"] for card in cards]
+        assert chosen[:2] == [card_ids[3], card_ids[5]]
+        assert len(chosen) == 6
+        assert card_ids[0] not in chosen
+
+    def test_small_deck_falls_back_to_reviews_not_yet_due(
+        self, client: TestClient, db, test_user, test_deck, test_user_token
+    ):
+        from app.models import SRSReview
+
+        card_ids = self._deck_cards(db, test_deck, 3)
+        db.add(SRSReview(user_id=test_user.id, card_id=card_ids[2], due_at=dt.datetime.now(dt.timezone.utc) + dt.timedelta(days=2)))
+        db.commit()
+
+        session_id = self._start(client, test_deck, test_user_token, 10)
+        cards = client.get(
+            f"/api/v1/study/sessions/{session_id}/cards",
+            headers={"Authorization": f"Bearer {test_user_token}"},
+        ).json()
+        chosen = [card["id"] for card in cards]
+        assert sorted(chosen[:2]) == card_ids[:2]
+        assert chosen[2] == card_ids[2]
+
+    def test_unlimited_session_returns_whole_deck(self, client: TestClient, db, test_deck, test_user_token):
+        card_ids = self._deck_cards(db, test_deck, 7)
+        session_id = self._start(client, test_deck, test_user_token, None)
+        cards = client.get(
+            f"/api/v1/study/sessions/{session_id}/cards",
+            headers={"Authorization": f"Bearer {test_user_token}"},
+        ).json()
+        assert sorted(card["id"] for card in cards) == card_ids
+        assert db.get(QuizSession, session_id).card_ids is None
+
+
 @pytest.mark.integration
 class TestGetSession:
     """Test GET /api/v1/study/sessions/{session_id} endpoint."""
@@ -83,6 +177,18 @@ class TestGetSession:
         response = client.get(f"/api/v1/study/sessions/{quiz_session.id}")
         assert response.status_code == 401
 
+    def test_session_cards_etag_not_modified(self, client: TestClient, quiz_session, basic_cards, test_user_token):
+        headers = {"Authorization": f"Bearer {test_user_token}"}
+        response = client.get(f"/api/v1/study/sessions/{quiz_session.id}/cards", headers=headers)
+        assert response.status_code == 200
+        etag = response.headers["ETag"]
+
+        cached = client.get(
+            f"/api/v1/study/sessions/{quiz_session.id}/cards",
+            headers={**headers, "If-None-Match": etag},
+        )
+        assert cached.status_code == 304
+
 
 @pytest.mark.integration
 class TestFinishSession:
@@ -225,6 +331,95 @@ class TestDueReviews:
         response = client.get("/api/v1/study/reviews/due")
         assert response.status_code == 401
 
+    def test_due_reviews_keyset_pages(self, client: TestClient, test_user, test_deck, db):
+        from app.models import Card, SRSReview
+
+        base = dt.datetime.now(dt.timezone.utc) - dt.timedelta(days=10)
+        for i in range(5):
+            card = Card(deck_id=test_deck.id, prompt=f"Q{i}", answer="A")
+            db.add(card)
+            db.flush()
+            # Two reviews share a due_at so the id tie-breaker is exercised.
+            db.add(SRSReview(user_id=test_user.id, card_id=card.id, due_at=base + dt.timedelta(days=min(i, 3))))
+        db.commit()
+
+        seen: list[int] = []
+        cursor = None
+        pages = 0
+        while True:
+            params = {"limit": 2} | ({"cursor": cursor} if cursor else {})
+            response = client.get("/api/v1/study/reviews/due", params=params)
+            assert response.status_code == 200
+            seen.extend(item["card_id"] for item in response.json())
+            pages += 1
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+
+        assert pages == 3
+        assert len(seen) == len(set(seen)) == 5
+
+    def test_due_reviews_invalid_cursor(self, client: TestClient):
+        response = client.get("/api/v1/study/reviews/due", params={"limit": 2, "cursor": "not-a-cursor"})
+        assert response.status_code == 400
+
+
+@pytest.mark.integration
+class TestReviewForecast:
+    """Test GET /api/v1/study/reviews/forecast endpoint."""
+
+    def _seed(self, db, test_user, test_deck, basic_cards):
+        from app.models import Card, Deck, SRSReview
+
+        other_deck = Deck(title="Other", owner_user_id=test_user.id)
+        db.add(other_deck)
+        db.flush()
+        other_card = Card(deck_id=other_deck.id, prompt="Q", answer="A")
+        db.add(other_card)
+        db.flush()
+
+        today = dt.datetime.now(dt.timezone.utc).replace(hour=12, minute=0, second=0, microsecond=0)
+        due = [
+            (basic_cards[0], today - dt.timedelta(days=4)),  # overdue, reported on today
+            (basic_cards[1], today + dt.timedelta(days=2)),
+            (basic_cards[2], today + dt.timedelta(days=40)),  # beyond the window
+            (other_card, today + dt.timedelta(days=2)),
+        ]
+        for card, due_at in due:
+            db.add(SRSReview(user_id=test_user.id, card_id=card.id, due_at=due_at))
+        db.commit()
+        return other_deck, today.date()
+
+    def test_forecast_counts_per_day(self, client: TestClient, db, test_user, test_deck, basic_cards, test_user_token):
+        _, today = self._seed(db, test_user, test_deck, basic_cards)
+        response = client.get(
+            "/api/v1/study/reviews/forecast?days=5",
+            headers={"Authorization": f"Bearer {test_user_token}"},
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert [item["date"] for item in data] == [str(today + dt.timedelta(days=i)) for i in range(5)]
+        assert [item["due_count"] for item in data] == [1, 0, 2, 0, 0]
+        assert "decks" not in data[0]
+
+    def test_forecast_deck_filter_and_breakdown(
+        self, client: TestClient, db, test_user, test_deck, basic_cards, test_user_token, query_counter
+    ):
+        other_deck, _ = self._seed(db, test_user, test_deck, basic_cards)
+        headers = {"Authorization": f"Bearer {test_user_token}"}
+
+        filtered = client.get(f"/api/v1/study/reviews/forecast?days=5&deck_id={other_deck.id}", headers=headers)
+        assert [item["due_count"] for item in filtered.json()] == [0, 0, 1, 0, 0]
+
+        query_counter.clear()
+        split = client.get("/api/v1/study/reviews/forecast?days=3&by_deck=true", headers=headers).json()
+        assert len([statement for statement in query_counter if "srs_reviews" in statement]) == 1
+        assert split[2]["decks"] == [
+            {"deck_id": test_deck.id, "due_count": 1},
+            {"deck_id": other_deck.id, "due_count": 1},
+        ]
+        assert split[1]["decks"] == []
+
 
 @pytest.mark.integration
 class TestPracticeModeEndless:
@@ -264,7 +459,7 @@ class TestSessionStatistics:
         assert data["unanswered_count"] == 0
 
     def test_get_session_statistics_with_responses(self, client: TestClient, quiz_session, test_cards, test_user_token, db):
-        from app.models import QuizResponse
+        from app.models import QuizResponse, QuizSession
 
         # Add some quiz responses
         responses = [
@@ -276,6 +471,8 @@ class TestSessionStatistics:
         for r in responses:
             db.add(r)
         db.commit()
+        # Responses inserted behind record_answer only reach the counters through a repair.
+        assert study_service.check_session_counters(db, repair=True) == [quiz_session.id]
 
         response = client.get(
             f"/api/v1/study/sessions/{quiz_session.id}/statistics",
@@ -288,6 +485,34 @@ class TestSessionStatistics:
         assert data["incorrect_count"] == 1
         assert data["unanswered_count"] == 1
 
+    def test_statistics_counters_follow_answers(
+        self, client: TestClient, db, quiz_session, basic_cards, test_user_token, query_counter
+    ):
+        headers = {"Authorization": f"Bearer {test_user_token}"}
+        client.post(
+            f"/api/v1/study/sessions/{quiz_session.id}/answer",
+            json={"card_id": basic_cards[0].id, "quality": 4},
+            headers=headers,
+        )
+        client.post(
+            f"/api/v1/study/sessions/{quiz_session.id}/answers",
+            json={"answers": [{"card_id": card.id, "quality": 3} for card in basic_cards[1:]]},
+            headers=headers,
+        )
+
+        query_counter.clear()
+        data = client.get(f"/api/v1/study/sessions/{quiz_session.id}/statistics", headers=headers).json()
+        assert data == {"total_responses": 3, "correct_count": 0, "incorrect_count": 0, "unanswered_count": 3}
+        assert not [statement for statement in query_counter if "quiz_responses" in statement]
+        assert study_service.check_session_counters(db) == []
+
+        db.add(QuizResponse(session_id=quiz_session.id, card_id=basic_cards[0].id, is_correct=True))
+        db.commit()
+        assert study_service.check_session_counters(db, repair=True) == [quiz_session.id]
+        assert study_service.check_session_counters(db) == []
+        data = client.get(f"/api/v1/study/sessions/{quiz_session.id}/statistics", headers=headers).json()
+        assert (data["total_responses"], data["correct_count"]) == (4, 1)
+
     def test_get_session_statistics_not_owner(self, client: TestClient, quiz_session, admin_user_token):
         response = client.get(
             f"/api/v1/study/sessions/{quiz_session.id}/statistics",
@@ -391,6 +616,8 @@ class TestActivityData:
         for session in sessions:
             db.add(session)
         db.commit()
+        # Rows inserted behind the service layer only reach the rollup through the backfill.
+        activity_service.backfill_daily_activity(db)
 
         response = client.get(
             "/api/v1/study/activity?days=7",
@@ -404,6 +631,80 @@ class TestActivityData:
         total_count = sum(item["count"] for item in data)
         assert total_count == 2
 
+    def test_activity_rollup_tracks_answers_and_finished_sessions(
+        self, client: TestClient, quiz_session, basic_cards, test_user_token
+    ):
+        headers = {"Authorization": f"Bearer {test_user_token}"}
+        for card in basic_cards[:2]:
+            client.post(
+                f"/api/v1/study/sessions/{quiz_session.id}/answer",
+                json={"card_id": card.id, "quality": 4},
+                headers=headers,
+            )
+        # Finishing twice must not count the session twice.
+        client.post(f"/api/v1/study/sessions/{quiz_session.id}/finish", headers=headers)
+        client.post(f"/api/v1/study/sessions/{quiz_session.id}/finish", headers=headers)
+
+        today = client.get("/api/v1/study/activity?days=1", headers=headers).json()
+        assert today == [{"date": str(dt.datetime.now(dt.timezone.utc).date()), "count": 1, "answers": 2, "correct": 0}]
+
+    def test_backfill_matches_incremental_rollup(
+        self, client: TestClient, db, test_user, quiz_session, basic_cards, test_user_token
+    ):
+        headers = {"Authorization": f"Bearer {test_user_token}"}
+        client.post(
+            f"/api/v1/study/sessions/{quiz_session.id}/answers",
+            json={"answers": [{"card_id": card.id, "quality": 5} for card in basic_cards]},
+            headers=headers,
+        )
+        client.post(f"/api/v1/study/sessions/{quiz_session.id}/finish", headers=headers)
+        incremental = activity_service.get_daily_activity(db, test_user, days=3)
+
+        assert activity_service.backfill_daily_activity(db) == 1
+        # Re-running rewrites the same rows.
+        assert activity_service.backfill_daily_activity(db) == 1
+        assert activity_service.get_daily_activity(db, test_user, days=3) == incremental
+        assert incremental[-1]["answers"] == 3
+
+    def test_history_days_are_utc_on_postgres(self):
+        from sqlalchemy.dialects import postgresql
+
+        stmt = activity_service._history_stmt(QuizSession.user_id.between(1, 10))
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        assert "date(timezone('UTC', quiz_sessions.started_at))" in sql
+        assert "date(timezone('UTC', quiz_responses.responded_at))" in sql
+
+    def test_deleting_a_deck_removes_its_activity(
+        self, client: TestClient, db, test_user, quiz_session, basic_cards, test_deck, test_user_token
+    ):
+        from app.models import Card, Deck
+
+        headers = {"Authorization": f"Bearer {test_user_token}"}
+        other_deck = Deck(title="Other Deck", is_public=True, owner_user_id=test_user.id)
+        db.add(other_deck)
+        db.commit()
+        other_card = Card(deck_id=other_deck.id, type="basic", prompt="Q", answer="A")
+        other_session = QuizSession(user_id=test_user.id, deck_id=other_deck.id, mode=QuizMode.REVIEW)
+        db.add(other_card)
+        db.add(other_session)
+        db.commit()
+        for session_id, card_ids in ((quiz_session.id, [card.id for card in basic_cards]), (other_session.id, [other_card.id])):
+            client.post(
+                f"/api/v1/study/sessions/{session_id}/answers",
+                json={"answers": [{"card_id": card_id, "quality": 5} for card_id in card_ids]},
+                headers=headers,
+            )
+            client.post(f"/api/v1/study/sessions/{session_id}/finish", headers=headers)
+
+        response = client.delete(f"/api/v1/decks/{test_deck.id}", headers=headers)
+        assert response.status_code == 200
+
+        remaining = activity_service.get_daily_activity(db, test_user, days=1)
+        assert remaining[-1]["count"] == 1
+        assert remaining[-1]["answers"] == 1
+        activity_service.backfill_daily_activity(db)
+        assert activity_service.get_daily_activity(db, test_user, days=1) == remaining
+
     def test_get_activity_no_auth(self, client: TestClient):
         """Test activity endpoint requires authentication."""
         response = client.get("/api/v1/study/activity")
@@ -916,3 +1217,198 @@ class TestLLMAnswerChecking:
         assert "llm_feedback" in data
         # llm_feedback will be None if LLM unavailable, or a string if available
         # We can't guarantee LLM availability in tests, so we just check the field exists
+
+
+@pytest.mark.integration
+class TestProgressCounters:
+    """Test the running counters kept on UserDeckProgress."""
+
+    def _answer(self, client: TestClient, session_id: int, card_id: int, quality: int = 4):
+        response = client.post(
+            f"/api/v1/study/sessions/{session_id}/answer",
+            json={"card_id": card_id, "quality": quality},
+        )
+        assert response.status_code == 200
+
+    def test_counters_track_distinct_cards(self, client: TestClient, quiz_session, basic_cards, test_user, db):
+        from app.models import UserDeckProgress
+
+        self._answer(client, quiz_session.id, basic_cards[0].id)
+        self._answer(client, quiz_session.id, basic_cards[0].id, quality=2)
+        self._answer(client, quiz_session.id, basic_cards[1].id)
+
+        progress = db.exec(
+            select(UserDeckProgress).where(UserDeckProgress.user_id == test_user.id)
+        ).one()
+        assert progress.total_cards == 3
+        assert progress.cards_reviewed == 2
+        assert progress.percent_complete == pytest.approx(200 / 3)
+
+    def test_counters_follow_card_additions(self, client: TestClient, quiz_session, basic_cards, test_deck, db):
+        from app.models import UserDeckProgress
+
+        self._answer(client, quiz_session.id, basic_cards[0].id)
+        response = client.post(f"/api/v1/decks/{test_deck.id}/cards", json={"prompt": "New", "answer": "Card"})
+        assert response.status_code == 201
+
+        progress = db.exec(select(UserDeckProgress)).one()
+        db.refresh(progress)
+        assert progress.total_cards == 4
+
+    def test_counters_follow_card_deletions(self, client: TestClient, quiz_session, basic_cards, test_deck, db):
+        from app.models import UserDeckProgress
+        from app.services.study import rebuild_progress_counters
+
+        self._answer(client, quiz_session.id, basic_cards[0].id)
+        self._answer(client, quiz_session.id, basic_cards[1].id)
+        response = client.delete(f"/api/v1/decks/{test_deck.id}/cards/{basic_cards[0].id}")
+        assert response.status_code == 200
+
+        progress = db.exec(select(UserDeckProgress)).one()
+        db.refresh(progress)
+        assert (progress.total_cards, progress.cards_reviewed) == (2, 1)
+        assert progress.percent_complete == pytest.approx(50.0)
+
+        rebuild_progress_counters(db)
+        db.refresh(progress)
+        assert (progress.total_cards, progress.cards_reviewed) == (2, 1)
+        assert progress.percent_complete == pytest.approx(50.0)
+
+    def test_card_deletion_keeps_session_history(self, client: TestClient, quiz_session, basic_cards, test_deck, db):
+        self._answer(client, quiz_session.id, basic_cards[0].id)
+        self._answer(client, quiz_session.id, basic_cards[1].id)
+        response = client.delete(f"/api/v1/decks/{test_deck.id}/cards/{basic_cards[0].id}")
+        assert response.status_code == 200
+
+        responses = db.exec(select(QuizResponse).where(QuizResponse.session_id == quiz_session.id)).all()
+        assert sorted(response.card_id or 0 for response in responses) == [0, basic_cards[1].id]
+        db.refresh(quiz_session)
+        assert quiz_session.total_responses == 2
+        assert study_service.check_session_counters(db) == []
+
+    def test_rebuild_progress_counters(self, client: TestClient, quiz_session, basic_cards, db):
+        from app.models import UserDeckProgress
+        from app.services.study import rebuild_progress_counters
+
+        self._answer(client, quiz_session.id, basic_cards[0].id)
+        self._answer(client, quiz_session.id, basic_cards[1].id)
+        progress = db.exec(select(UserDeckProgress)).one()
+        progress.cards_reviewed = 0
+        progress.total_cards = 0
+        progress.percent_complete = 0.0
+        db.add(progress)
+        db.commit()
+
+        assert rebuild_progress_counters(db) == 1
+        db.refresh(progress)
+        assert progress.total_cards == 3
+        assert progress.cards_reviewed == 2
+        assert progress.percent_complete == pytest.approx(200 / 3)
+
+
+@pytest.mark.integration
+class TestBatchAnswers:
+    """Test POST /api/v1/study/sessions/{session_id}/answers endpoint."""
+
+    def test_batch_answers_applied_in_order(self, client: TestClient, quiz_session, basic_cards, test_user, db):
+        from app.models import SRSReview, UserDeckProgress
+
+        answers = [
+            {"card_id": basic_cards[0].id, "quality": 5},
+            {"card_id": basic_cards[0].id, "quality": 5},
+            {"card_id": basic_cards[1].id, "quality": 1},
+        ]
+        response = client.post(f"/api/v1/study/sessions/{quiz_session.id}/answers", json={"answers": answers})
+        assert response.status_code == 200
+        data = response.json()
+        assert [item["card_id"] for item in data] == [a["card_id"] for a in answers]
+
+        review = db.exec(select(SRSReview).where(SRSReview.card_id == basic_cards[0].id)).one()
+        assert review.repetitions == 2
+        assert review.interval_days == 6
+        progress = db.exec(select(UserDeckProgress).where(UserDeckProgress.user_id == test_user.id)).one()
+        assert progress.cards_reviewed == 2
+
+    def test_batch_answers_rejects_foreign_card(self, client: TestClient, quiz_session, basic_cards, db):
+        from app.models import QuizResponse, QuizSession
+
+        answers = [{"card_id": basic_cards[0].id, "quality": 4}, {"card_id": 999999, "quality": 4}]
+        response = client.post(f"/api/v1/study/sessions/{quiz_session.id}/answers", json={"answers": answers})
+        assert response.status_code == 404
+        assert db.exec(select(QuizResponse)).first() is None
+
+    def test_batch_answers_query_count_independent_of_size(self, db, quiz_session, basic_cards, test_user, query_counter):
+        from app.schemas.study import StudyAnswerCreate
+        from app.services.study import record_answers
+
+        def run(count: int) -> int:
+            db.refresh(quiz_session)
+            db.refresh(test_user)
+            answers = [StudyAnswerCreate(card_id=basic_cards[i % 3].id, quality=4) for i in range(count)]
+            query_counter.clear()
+            record_answers(db, quiz_session, test_user, answers)
+            return sum(1 for statement in query_counter if statement.startswith("SELECT"))
+
+        run(3)
+        assert run(3) == run(30) == 3
+
+
+@pytest.mark.integration
+class TestAsyncAnswerPath:
+    """Test the AsyncSession-backed answer path."""
+
+    def test_submit_answer_through_async_session(self, tmp_path):
+        from sqlalchemy.ext.asyncio import create_async_engine
+        from sqlmodel import Session, SQLModel, create_engine
+        from sqlmodel.ext.asyncio.session import AsyncSession
+
+        from app.db.session import get_async_db, get_db
+        from app.main import app
+        from app.models import Card, Deck, QuizResponse, QuizSession, SRSReview, User
+
+        database = tmp_path / "async.db"
+        sync_engine = create_engine(f"sqlite:///{database}")
+        SQLModel.metadata.create_all(sync_engine)
+        async_engine = create_async_engine(f"sqlite+aiosqlite:///{database}")
+
+        with Session(sync_engine) as db:
+            user = User(email="async@example.com", hashed_password="x")
+            db.add(user)
+            db.flush()
+            deck = Deck(title="Async", owner_user_id=user.id)
+            db.add(deck)
+            db.flush()
+            card = Card(deck_id=deck.id, prompt="Q", answer="A")
+            quiz_session = QuizSession(user_id=user.id, deck_id=deck.id, mode=QuizMode.REVIEW)
+            db.add_all([card, quiz_session])
+            db.commit()
+            card_id, session_id = card.id, quiz_session.id
+
+        def get_db_override():
+            with Session(sync_engine) as session:
+                yield session
+
+        async def get_async_db_override():
+            async with AsyncSession(async_engine, expire_on_commit=False) as session:
+                yield session
+
+        app.dependency_overrides[get_db] = get_db_override
+        app.dependency_overrides[get_async_db] = get_async_db_override
+        try:
+            response = TestClient(app).post(
+                f"/api/v1/study/sessions/{session_id}/answer",
+                json={"card_id": card_id, "quality": 5},
+            )
+            missing = TestClient(app).post(
+                f"/api/v1/study/sessions/{session_id}/answer",
+                json={"card_id": 999999, "quality": 5},
+            )
+        finally:
+            app.dependency_overrides.clear()
+
+        assert response.status_code == 200
+        assert response.json()["quality"] == 5
+        assert missing.status_code == 404
+        with Session(sync_engine) as db:
+            assert db.exec(select(QuizResponse)).one().card_id == card_id
+            assert db.exec(select(SRSReview)).one().repetitions == 1
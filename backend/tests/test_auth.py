@@ -0,0 +1,104 @@
+"""Tests for password hashing and authentication helpers."""
+import inspect
+import time
+
+import pytest
+from fastapi import HTTPException
+from passlib.context import CryptContext
+
+from app.api.deps import get_current_admin
+from app.api.routes import users as users_routes
+from app.main import app
+from app.models import User
+from app.services import auth
+from app.services.token_cache import TokenCache, token_cache
+
+
+def test_hash_and_verify_through_worker_pool():
+    hashed = auth.hash_password("correct horse")
+    assert auth.verify_password("correct horse", hashed)
+    assert not auth.verify_password("wrong horse", hashed)
+
+
+@pytest.mark.asyncio
+async def test_async_hash_and_verify():
+    hashed = await auth.hash_password_async("battery staple")
+    assert await auth.verify_password_async("battery staple", hashed)
+
+
+def test_change_password_awaits_hashing_pool(client, db, test_user):
+    # An async handler awaits the hashing pool instead of parking a threadpool worker on it.
+    assert inspect.iscoroutinefunction(users_routes.change_password)
+    wrong = client.put("/api/v1/me/password", json={"current_password": "nope", "new_password": "n3w-secret"})
+    assert wrong.status_code == 400
+    response = client.put(
+        "/api/v1/me/password", json={"current_password": "testpassword123", "new_password": "n3w-secret"}
+    )
+    assert response.status_code == 200
+    db.refresh(test_user)
+    assert auth.pwd_context.verify("n3w-secret", test_user.hashed_password)
+
+
+def test_login_rehashes_outdated_parameters(db):
+    legacy_context = CryptContext(schemes=["argon2"], argon2__rounds=1, argon2__memory_cost=1024)
+    legacy_hash = legacy_context.hash("legacy-password")
+    user = User(email="legacy@example.com", hashed_password=legacy_hash)
+    db.add(user)
+    db.commit()
+
+    assert auth.authenticate_user(db, "legacy@example.com", "wrong") is None
+    assert auth.authenticate_user(db, "legacy@example.com", "legacy-password") is not None
+    db.refresh(user)
+    assert user.hashed_password != legacy_hash
+    assert not auth.pwd_context.needs_update(user.hashed_password)
+    assert auth.verify_password("legacy-password", user.hashed_password)
+
+
+def test_decode_token_caches_verified_payload(monkeypatch):
+    calls = []
+    real_decode = auth.jwt.decode
+    monkeypatch.setattr(auth.jwt, "decode", lambda *args, **kwargs: calls.append(1) or real_decode(*args, **kwargs))
+
+    token = auth.create_access_token("42")
+    first = auth.decode_token(token)
+    second = auth.decode_token(token)
+
+    assert first == second
+    assert first["sub"] == "42"
+    assert len(calls) == 1
+    assert token_cache.stats() == {"hits": 1, "misses": 1, "size": 1, "max_entries": token_cache.max_entries}
+
+
+def test_token_cache_stats_endpoint(client, admin_user):
+    token = auth.create_access_token("42")
+    auth.decode_token(token)
+    auth.decode_token(token)
+    auth.decode_token(token)
+
+    app.dependency_overrides[get_current_admin] = lambda: admin_user
+    try:
+        response = client.get("/api/v1/metrics/token-cache")
+    finally:
+        app.dependency_overrides.pop(get_current_admin)
+    assert response.status_code == 200
+    assert response.json() == {"hits": 2, "misses": 1, "size": 1, "max_entries": token_cache.max_entries}
+
+
+def test_decode_token_cache_is_per_token_type():
+    token = auth.create_access_token("7")
+    auth.decode_token(token)
+    with pytest.raises(HTTPException):
+        auth.decode_token(token, token_type="refresh")
+
+
+def test_token_cache_entries_expire_at_exp():
+    cache = TokenCache(max_entries=2)
+    cache.put("expired", "access", {"sub": "1", "exp": time.time() - 1})
+    cache.put("live", "access", {"sub": "2", "exp": time.time() + 60})
+    assert cache.get("expired", "access") is None
+    assert cache.get("live", "access") == {"sub": "2", "exp": pytest.approx(time.time() + 60, abs=5)}
+
+    cache.put("newer", "access", {"sub": "3", "exp": time.time() + 60})
+    cache.put("newest", "access", {"sub": "4", "exp": time.time() + 60})
+    assert cache.stats()["size"] == 2
+    assert cache.get("live", "access") is None
@@ -0,0 +1,133 @@
+"""Tests for the in-memory due-card queue."""
+import datetime as dt
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.models import Card, SRSReview, User
+from app.services import study as study_service
+from app.services.due_queue import DueQueue, due_queue
+
+NOW = dt.datetime(2024, 6, 1, 12, tzinfo=dt.timezone.utc)
+
+
+def _review_queries(statements: list[str]) -> list[str]:
+    return [statement for statement in statements if "FROM srs_reviews" in statement]
+
+
+def _seed_reviews(db: Session, user: User, deck_id: int, offsets_in_days: list[int]) -> list[Card]:
+    cards = []
+    for offset in offsets_in_days:
+        card = Card(deck_id=deck_id, prompt="Q", answer="A")
+        db.add(card)
+        db.flush()
+        db.add(SRSReview(user_id=user.id, card_id=card.id, due_at=NOW + dt.timedelta(days=offset)))
+        cards.append(card)
+    db.commit()
+    return cards
+
+
+@pytest.mark.integration
+class TestDueQueue:
+    def test_warms_once_then_answers_without_queries(self, db: Session, test_user: User, test_deck, query_counter):
+        ids = [card.id for card in _seed_reviews(db, test_user, test_deck.id, [-1, -3, 2])]
+        user_id = test_user.id
+        queue = DueQueue(max_entries=100)
+
+        query_counter.clear()
+        assert queue.next_due(db, user_id, now=NOW) == (NOW - dt.timedelta(days=3), ids[1])
+        assert len(_review_queries(query_counter)) == 1
+
+        query_counter.clear()
+        queue.record(user_id, ids[1], NOW + dt.timedelta(days=6))
+        assert queue.next_due(db, user_id, now=NOW) == (NOW - dt.timedelta(days=1), ids[0])
+        queue.record(user_id, ids[0], NOW + dt.timedelta(days=1))
+        assert queue.next_due(db, user_id, now=NOW) is None
+        assert queue.next_due(db, user_id, now=NOW + dt.timedelta(days=1)) == (NOW + dt.timedelta(days=1), ids[0])
+        assert query_counter == []
+
+    def test_evicts_least_recently_used_user(self, db: Session, test_user: User, admin_user: User, test_deck):
+        _seed_reviews(db, test_user, test_deck.id, [-1, -2])
+        _seed_reviews(db, admin_user, test_deck.id, [-1, -2])
+        queue = DueQueue(max_entries=3)
+
+        queue.next_due(db, test_user.id, now=NOW)
+        queue.next_due(db, admin_user.id, now=NOW)
+        assert queue.stats() == {"users": 1, "entries": 2, "max_entries": 3}
+
+    def test_over_cap_user_is_remembered(self, db: Session, test_user: User, test_deck, query_counter):
+        _seed_reviews(db, test_user, test_deck.id, [-1, -2, -3])
+        user_id = test_user.id
+        queue = DueQueue(max_entries=2)
+
+        query_counter.clear()
+        for _ in range(3):
+            with pytest.raises(LookupError):
+                queue.next_due(db, user_id, now=NOW)
+        assert len(_review_queries(query_counter)) == 1
+        assert queue.stats()["entries"] == 0
+
+        queue.invalidate(user_id)
+        with pytest.raises(LookupError):
+            queue.next_due(db, user_id, now=NOW)
+        assert len(_review_queries(query_counter)) == 2
+
+    def test_reschedule_during_load_is_replayed(self, db: Session, test_user: User, test_deck, monkeypatch):
+        ids = [card.id for card in _seed_reviews(db, test_user, test_deck.id, [-2, -1])]
+        user_id = test_user.id
+        queue = DueQueue(max_entries=100)
+        exec_rows = db.exec
+
+        def exec_then_answer(statement, *args, **kwargs):
+            result = exec_rows(statement, *args, **kwargs)
+            # Another request reschedules the first card after the heap rows were read.
+            queue.record(user_id, ids[0], NOW + dt.timedelta(days=4))
+            return result
+
+        monkeypatch.setattr(db, "exec", exec_then_answer)
+        assert queue.next_due(db, user_id, now=NOW) == (NOW - dt.timedelta(days=1), ids[1])
+
+    def test_deleted_cards_are_not_served(
+        self, client: TestClient, db: Session, test_user: User, test_deck, test_user_token, monkeypatch
+    ):
+        monkeypatch.setattr(due_queue, "max_entries", 100)
+        first, second = _seed_reviews(db, test_user, test_deck.id, [-1000, -999])
+        first_id, second_id, deck_id = first.id, second.id, test_deck.id
+        headers = {"Authorization": f"Bearer {test_user_token}"}
+
+        assert client.get("/api/v1/study/reviews/next", headers=headers).json()["card_id"] == first_id
+        client.delete(f"/api/v1/decks/{deck_id}/cards/{first_id}", headers=headers)
+        assert client.get("/api/v1/study/reviews/next", headers=headers).json()["card_id"] == second_id
+
+        client.delete(f"/api/v1/decks/{deck_id}", headers=headers)
+        assert client.get("/api/v1/study/reviews/next", headers=headers).json() is None
+
+    def test_disabled_queue_falls_back_to_sql(self, db: Session, test_user: User, test_deck):
+        cards = _seed_reviews(db, test_user, test_deck.id, [-2, 5])
+        assert not due_queue.enabled
+        assert study_service.next_due_card(db, test_user)[1] == cards[0].id
+
+    def test_answer_reschedules_card_in_queue(
+        self, client: TestClient, db: Session, test_user: User, test_deck, quiz_session, test_user_token, monkeypatch
+    ):
+        monkeypatch.setattr(due_queue, "max_entries", 100)
+        now = dt.datetime.now(dt.timezone.utc)
+        first, second = _seed_reviews(db, test_user, test_deck.id, [-1000, -999])
+        headers = {"Authorization": f"Bearer {test_user_token}"}
+
+        assert client.get("/api/v1/study/reviews/next", headers=headers).json()["card_id"] == first.id
+        client.post(
+            f"/api/v1/study/sessions/{quiz_session.id}/answer",
+            json={"card_id": first.id, "quality": 5},
+            headers=headers,
+        )
+        assert client.get("/api/v1/study/reviews/next", headers=headers).json()["card_id"] == second.id
+
+        client.post(
+            f"/api/v1/study/sessions/{quiz_session.id}/answers",
+            json={"answers": [{"card_id": second.id, "quality": 4}]},
+            headers=headers,
+        )
+        assert client.get("/api/v1/study/reviews/next", headers=headers).json() is None
+        assert due_queue.next_due(db, test_user.id, now=now + dt.timedelta(days=2)) is not None
@@ -0,0 +1,67 @@
+"""Tests for connection pool settings and metrics."""
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from app.api.deps import get_current_admin
+from app.db.pool_metrics import PoolMetrics
+from app.main import app
+from app.models import User
+
+
+@pytest.fixture(name="metered_engine")
+def metered_engine_fixture(tmp_path):
+    metrics = PoolMetrics()
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=metrics.queue_pool_class(),
+        pool_size=1,
+        max_overflow=1,
+        pool_timeout=1,
+        pool_pre_ping=True,
+    )
+    metrics.attach(engine)
+    yield engine, metrics
+    engine.dispose()
+
+
+@pytest.mark.integration
+class TestPoolMetrics:
+    def test_tracks_checkouts_overflow_and_wait(self, metered_engine):
+        engine, metrics = metered_engine
+        first, second = engine.connect(), engine.connect()
+        stats = metrics.snapshot(engine)
+        assert stats["checked_out"] == 2
+        assert stats["overflow"] == 1
+        assert stats["connections_opened"] == 2
+        assert stats["checkout_wait_ms"]["count"] == 2
+        assert stats["checkout_wait_ms"]["buckets"]["+Inf"] == 2
+
+        first.close()
+        second.close()
+        stats = metrics.snapshot(engine)
+        assert stats["checked_out"] == 0
+        assert stats["checkouts"] == 2
+
+    def test_counts_pre_ping_failures(self, metered_engine):
+        engine, metrics = metered_engine
+        with engine.connect() as connection:
+            pooled = connection.connection.dbapi_connection
+        # Simulate the server dropping the idle pooled connection.
+        pooled.close()
+
+        with engine.connect() as connection:
+            assert connection.execute(text("SELECT 1")).scalar() == 1
+        stats = metrics.snapshot(engine)
+        assert stats["pre_ping_failures"] == 1
+        assert stats["invalidations"] == 1
+        assert stats["connections_opened"] == 2
+
+    def test_endpoint_reports_app_pool(self, admin_user: User):
+        app.dependency_overrides[get_current_admin] = lambda: admin_user
+        try:
+            response = TestClient(app).get("/api/v1/metrics/db-pool")
+        finally:
+            app.dependency_overrides.clear()
+        assert response.status_code == 200
+        assert set(response.json()["checkout_wait_ms"]) == {"buckets", "count", "sum"}
@@ -0,0 +1,72 @@
+"""Tests for full-text search over decks and cards."""
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.models import Card, Deck, User
+from app.schemas.search import SearchResults
+from app.services import search as search_service
+
+
+def _add_cards(db: Session, deck: Deck, *pairs: tuple[str, str]) -> list[Card]:
+    cards = [Card(deck_id=deck.id, prompt=prompt, answer=answer) for prompt, answer in pairs]
+    db.add_all(cards)
+    db.commit()
+    return cards
+
+
+@pytest.mark.integration
+class TestSearch:
+    def test_ranks_decks_and_cards_with_snippets(self, client: TestClient, db: Session, test_deck: Deck):
+        _add_cards(
+            db,
+            test_deck,
+            ("What is photosynthesis?", "How plants turn light into sugar"),
+            ("Where does it happen?", "In the chloroplast, during photosynthesis"),
+            ("Capital of France?", "Paris"),
+        )
+        db.add(Deck(title="Photosynthesis basics", owner_user_id=test_deck.owner_user_id, is_public=True))
+        db.commit()
+
+        response = client.get("/api/v1/search", params={"q": "photosynthesis"})
+        assert response.status_code == 200
+        data = response.json()
+        assert [hit["title"] for hit in data["decks"]] == ["Photosynthesis basics"]
+        assert "<mark>Photosynthesis</mark>" in data["decks"][0]["snippet"]
+        # The prompt is weighted above the answer.
+        assert [hit["prompt"] for hit in data["cards"]] == ["What is photosynthesis?", "Where does it happen?"]
+        assert data["cards"][0]["score"] > data["cards"][1]["score"]
+
+    def test_last_word_matches_as_prefix(self, db: Session, test_deck: Deck):
+        _add_cards(db, test_deck, ("Explain mitochondria", "Powerhouse of the cell"))
+        results = search_service.search(db, None, "explain mito")
+        assert [hit.prompt for hit in results.cards] == ["Explain mitochondria"]
+
+    def test_private_decks_visible_to_owner_only(
+        self, db: Session, private_deck: Deck, test_user: User, admin_user: User
+    ):
+        _add_cards(db, private_deck, ("Secret glossary term", "Hidden"))
+
+        assert search_service.search(db, admin_user, "glossary") == SearchResults(decks=[], cards=[])
+        assert search_service.search(db, admin_user, "private") == SearchResults(decks=[], cards=[])
+        owner = search_service.search(db, test_user, "glossary")
+        assert [hit.prompt for hit in owner.cards] == ["Secret glossary term"]
+        assert [hit.title for hit in search_service.search(db, test_user, "private").decks] == ["Private Deck"]
+
+    def test_index_follows_updates_and_deletes(self, db: Session, test_deck: Deck):
+        (card,) = _add_cards(db, test_deck, ("Old wording", "Answer"))
+        card.prompt = "Fresh wording"
+        db.add(card)
+        db.commit()
+        assert search_service.search(db, None, "old").cards == []
+        assert [hit.id for hit in search_service.search(db, None, "fresh").cards] == [card.id]
+
+        db.delete(card)
+        db.commit()
+        assert search_service.search(db, None, "fresh").cards == []
+
+    @pytest.mark.parametrize("q", ["***", "\"(", " - "])
+    def test_query_without_words_returns_nothing(self, client: TestClient, basic_cards: list[Card], q: str):
+        response = client.get("/api/v1/search", params={"q": q})
+        assert response.status_code == 200
+        assert response.json() == {"decks": [], "cards": []}
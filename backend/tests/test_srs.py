@@ -1,6 +1,11 @@
 import datetime as dt
 
+import numpy as np
+import pytest
+from fastapi import HTTPException
+
 from app.models.study import SRSReview
+from app.services import srs_batch
 from app.services.study import _apply_sm2
 
 
@@ -19,3 +24,65 @@ def test_sm2_high_quality_increases_interval():
     assert review.interval_days >= 6
     assert review.easiness >= 2.5
 
+
+def _scalar_sm2(repetitions: int, interval_days: int, easiness: float, quality: int) -> SRSReview:
+    review = SRSReview(user_id=1, card_id=1, repetitions=repetitions, interval_days=interval_days, easiness=easiness)
+    _apply_sm2(review, quality)
+    return review
+
+
+def test_batch_schedule_matches_scalar_sm2():
+    rng = np.random.default_rng(20240404)
+    size = 20_000
+    repetitions = rng.integers(0, 12, size)
+    interval_days = rng.integers(1, 400, size)
+    # Include exact half-way products to exercise round-half-to-even.
+    easiness = np.where(rng.random(size) < 0.2, 2.5, rng.uniform(1.3, 3.5, size))
+    quality = rng.integers(0, 6, size)
+
+    state = srs_batch.schedule(repetitions, interval_days, easiness, quality)
+
+    for i in range(size):
+        expected = _scalar_sm2(int(repetitions[i]), int(interval_days[i]), float(easiness[i]), int(quality[i]))
+        assert state.repetitions[i] == expected.repetitions
+        assert state.interval_days[i] == expected.interval_days
+        assert state.easiness[i] == expected.easiness
+
+
+def test_batch_replay_matches_sequential_sm2():
+    rng = np.random.default_rng(7)
+    history = rng.integers(-1, 6, (500, 12))
+
+    state = srs_batch.replay(history)
+
+    for row, qualities in enumerate(history):
+        review = SRSReview(user_id=1, card_id=1, repetitions=0, interval_days=1, easiness=2.5)
+        for quality in qualities:
+            if quality != srs_batch.NO_ANSWER:
+                _apply_sm2(review, int(quality))
+        assert state.repetitions[row] == review.repetitions
+        assert state.interval_days[row] == review.interval_days
+        assert state.easiness[row] == review.easiness
+
+
+def test_batch_schedule_rejects_invalid_quality():
+    with pytest.raises(HTTPException):
+        srs_batch.schedule([0], [1], [2.5], [6])
+
+
+def test_apply_qualities_writes_in_chunks(db, test_user, basic_cards):
+    now = dt.datetime.now(dt.timezone.utc)
+    reviews = [SRSReview(user_id=test_user.id, card_id=card.id, due_at=now) for card in basic_cards]
+    for review in reviews:
+        db.add(review)
+    db.commit()
+    review_ids = [review.id for review in reviews]
+
+    assert srs_batch.apply_qualities(db, review_ids, [5, 1, 4], now=now, chunk_size=2) == 3
+
+    for review, quality in zip(reviews, [5, 1, 4]):
+        db.refresh(review)
+        expected = _scalar_sm2(0, 1, 2.5, quality)
+        assert review.repetitions == expected.repetitions
+        assert review.easiness == expected.easiness
+        assert review.last_quality == quality
@@ -0,0 +1,72 @@
+"""Tests for streak computation and the bulk recomputation job."""
+import datetime as dt
+
+import pytest
+from sqlmodel import Session
+
+from app.models import QuizSession, User
+from app.models.enums import QuizMode, QuizStatus
+from app.services import streak as streak_service
+
+DAY = dt.date(2024, 3, 1)
+
+
+def _days(*offsets: int) -> list[dt.date]:
+    return [DAY + dt.timedelta(days=offset) for offset in offsets]
+
+
+def test_streaks_from_no_days():
+    assert streak_service.streaks_from_days([]) == (0, 0, None)
+
+
+def test_streaks_from_days_tracks_last_and_longest_runs():
+    current, longest, last = streak_service.streaks_from_days(_days(0, 1, 2, 5, 6))
+    assert (current, longest, last) == (2, 3, DAY + dt.timedelta(days=6))
+
+
+def _complete_session(db: Session, user: User, deck_id: int, day: dt.date) -> None:
+    moment = dt.datetime.combine(day, dt.time(12), tzinfo=dt.timezone.utc)
+    db.add(
+        QuizSession(
+            user_id=user.id,
+            deck_id=deck_id,
+            mode=QuizMode.REVIEW,
+            status=QuizStatus.COMPLETED,
+            started_at=moment,
+            ended_at=moment,
+        )
+    )
+
+
+@pytest.mark.integration
+class TestRecomputeAllStreaks:
+    def test_recompute_rebuilds_and_is_idempotent(self, db: Session, test_user: User, admin_user: User, test_deck):
+        for day in _days(0, 1, 2, 4, 4, 5):
+            _complete_session(db, test_user, test_deck.id, day)
+        admin_user.current_streak = 9
+        admin_user.longest_streak = 9
+        admin_user.last_activity_date = DAY
+        db.add(admin_user)
+        db.commit()
+
+        stats = streak_service.recompute_all_streaks(db, chunk_size=1)
+        assert (stats.users, stats.active_users) == (2, 1)
+        assert stats.users_per_second > 0
+
+        for _ in range(2):
+            db.refresh(test_user)
+            db.refresh(admin_user)
+            assert (test_user.current_streak, test_user.longest_streak) == (2, 3)
+            assert test_user.last_activity_date == DAY + dt.timedelta(days=5)
+            assert (admin_user.current_streak, admin_user.longest_streak, admin_user.last_activity_date) == (0, 0, None)
+            streak_service.recompute_all_streaks(db)
+
+    def test_recompute_pages_user_ids_by_keyset(self, db: Session, test_user: User, admin_user: User, query_counter):
+        query_counter.clear()
+        streak_service.recompute_all_streaks(db, chunk_size=1)
+
+        id_queries = [statement for statement in query_counter if statement.startswith("SELECT users.id")]
+        # Two full chunks of one user each, then an empty seek past the last id.
+        assert len(id_queries) == 3
+        assert all("LIMIT" in statement for statement in id_queries)
+        assert all("users.id >" in statement for statement in id_queries[1:])
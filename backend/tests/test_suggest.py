@@ -0,0 +1,66 @@
+"""Tests for the in-process typeahead index."""
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.models import Deck, User
+from app.schemas.card import CardCreate
+from app.schemas.deck import DeckCreate
+from app.services import decks as deck_service
+from app.services.suggest import PrefixIndex, suggest_index
+
+
+@pytest.mark.integration
+class TestSuggest:
+    def test_load_matches_prefix_case_insensitively(
+        self, db: Session, test_deck: Deck, private_deck: Deck, test_user: User, admin_user: User
+    ):
+        index = PrefixIndex()
+        index.load(db)
+
+        assert index.suggest("TEST", test_user.id)["decks"] == [{"id": test_deck.id, "title": "Test Deck"}]
+        assert [deck["title"] for deck in index.suggest("pri", test_user.id)["decks"]] == ["Private Deck"]
+        assert index.suggest("pri", admin_user.id)["decks"] == []
+        assert index.suggest("pri", None)["decks"] == []
+
+    def test_limit_and_order(self):
+        index = PrefixIndex()
+        index.add_tags(["biology", "Bio", "botany", "bio-chem", "Bio"])
+        assert index.suggest("bio", None)["tags"] == ["Bio", "bio-chem", "biology"]
+        assert index.suggest("b", None, limit=2)["tags"] == ["Bio", "bio-chem"]
+
+    def test_deck_writes_update_index_without_queries(self, client: TestClient, query_counter):
+        created = client.post("/api/v1/decks", json={"title": "Spanish verbs", "tag_names": ["spanish", "verbs"]})
+        assert created.status_code == 201
+        deck_id = created.json()["id"]
+
+        query_counter.clear()
+        response = client.get("/api/v1/suggest", params={"prefix": "sp"})
+        assert response.status_code == 200
+        assert response.json() == {"tags": ["spanish"], "decks": [{"id": deck_id, "title": "Spanish verbs"}]}
+        assert not [statement for statement in query_counter if "decks" in statement or "tags" in statement]
+
+        client.put(f"/api/v1/decks/{deck_id}", json={"title": "Verbos", "tag_names": ["spanish", "verbos"]})
+        assert client.get("/api/v1/suggest", params={"prefix": "sp"}).json()["decks"] == []
+        assert client.get("/api/v1/suggest", params={"prefix": "verb"}).json() == {
+            "tags": ["verbos", "verbs"],
+            "decks": [{"id": deck_id, "title": "Verbos"}],
+        }
+
+        client.delete(f"/api/v1/decks/{deck_id}")
+        assert suggest_index.suggest("verb", None)["decks"] == []
+
+    def test_rolled_back_create_leaves_index_untouched(self, db: Session, test_user: User, monkeypatch):
+        def failing_insert(*args):
+            raise RuntimeError("card insert failed")
+
+        monkeypatch.setattr(deck_service, "_insert_cards", failing_insert)
+        deck_in = DeckCreate(
+            title="Doomed", tag_names=["ephemeral"], cards=[CardCreate(type="basic", prompt="Q", answer="A")]
+        )
+        with pytest.raises(RuntimeError):
+            deck_service.create_deck(db, test_user, deck_in)
+        db.rollback()
+
+        assert suggest_index.suggest("ephem", None) == {"tags": [], "decks": []}
+        assert suggest_index.suggest("doom", None) == {"tags": [], "decks": []}
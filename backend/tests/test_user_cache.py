@@ -0,0 +1,48 @@
+"""Tests for request user resolution and the process-wide user cache."""
+import pytest
+from fastapi.testclient import TestClient
+
+from app.services.user_cache import user_cache
+
+
+def _user_queries(statements: list[str]) -> list[str]:
+    return [statement for statement in statements if "FROM users" in statement]
+
+
+@pytest.fixture(name="cache_enabled")
+def cache_enabled_fixture(monkeypatch):
+    monkeypatch.setattr(user_cache, "ttl_seconds", 30.0)
+
+
+@pytest.mark.integration
+class TestUserResolution:
+    def test_warm_cache_skips_user_query(self, client: TestClient, test_user, query_counter, cache_enabled):
+        assert client.get("/api/v1/me").status_code == 200
+        assert len(_user_queries(query_counter)) == 1
+
+        query_counter.clear()
+        response = client.get("/api/v1/me")
+        assert response.status_code == 200
+        assert response.json()["email"] == test_user.email
+        assert _user_queries(query_counter) == []
+
+    def test_password_change_evicts_cached_user(self, client: TestClient, test_user, query_counter, cache_enabled):
+        client.get("/api/v1/me")
+        assert user_cache.get(test_user.id) is not None
+
+        response = client.put(
+            "/api/v1/me/password",
+            json={"current_password": "testpassword123", "new_password": "newpassword456"},
+        )
+        assert response.status_code == 200
+        assert user_cache.get(test_user.id) is None
+
+        query_counter.clear()
+        client.get("/api/v1/me")
+        assert len(_user_queries(query_counter)) == 1
+
+    def test_disabled_cache_resolves_every_request(self, client: TestClient, test_user, query_counter):
+        assert not user_cache.enabled
+        client.get("/api/v1/me")
+        client.get("/api/v1/me")
+        assert len(_user_queries(query_counter)) == 2